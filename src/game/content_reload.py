@@ -0,0 +1,94 @@
+import os
+import time
+from typing import Callable
+
+from .data_loader import SOURCES, ContentStore, close_superseded, reload_sections
+
+# Seconds between stat() sweeps over the content files, and how long a changed file has to stay
+# unchanged before it is reparsed (editors often write a file in several steps).
+POLL_INTERVAL = 0.5
+DEBOUNCE = 0.3
+
+# Called with the new store and the names of the sections that changed.
+ReloadCallback = Callable[[ContentStore, frozenset[str]], None]
+
+
+def _stat(path: os.PathLike) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ContentReloader:
+    # Opt-in hot reload of data/stores and resources (TERM_REALMS_HOT_RELOAD). poll() is called
+    # from the game loop at points where swapping tables is safe, so there is no watcher thread
+    # and no locking: a changed file is reparsed on its own, a new ContentStore sharing every
+    # other table replaces `store` in one assignment, and subscribers refresh what they derived
+    # from it. A file that fails validation or cannot be read keeps the previous tables and sets
+    # `last_error`.
+    def __init__(
+        self,
+        store: ContentStore,
+        enabled: bool = False,
+        interval: float = POLL_INTERVAL,
+        debounce: float = DEBOUNCE,
+    ) -> None:
+        self.store = store
+        self.enabled = enabled
+        self.interval = interval
+        self.debounce = debounce
+        self.reloads = 0
+        self.last_error: str | None = None
+        self._callbacks: list[ReloadCallback] = []
+        self._next_poll = 0.0
+        self._seen = {name: _stat(path) for name, (path, _) in SOURCES.items()} if enabled else {}
+        self._pending: dict[str, tuple[tuple[int, int] | None, float]] = {}
+
+    def subscribe(self, callback: ReloadCallback) -> None:
+        self._callbacks.append(callback)
+
+    def poll(self, now: float | None = None) -> bool:
+        if not self.enabled:
+            return False
+        now = time.monotonic() if now is None else now
+        if now < self._next_poll:
+            return False
+        self._next_poll = now + self.interval
+
+        ready: list[str] = []
+        for name, (path, _) in SOURCES.items():
+            stat = _stat(path)
+            if stat == self._seen[name]:
+                self._pending.pop(name, None)
+                continue
+            pending = self._pending.get(name)
+            if pending is None or pending[0] != stat:
+                self._pending[name] = (stat, now)
+            elif stat is not None and now - pending[1] >= self.debounce:
+                ready.append(name)
+        if not ready:
+            return False
+
+        for name in ready:
+            self._seen[name] = self._pending.pop(name)[0]
+        try:
+            store = reload_sections(self.store, ready)
+        except (OSError, ValueError) as exc:
+            # Invalid content, or a file deleted or renamed since the stat sweep (editors that
+            # save by rename). Not retried until the file changes again.
+            self.last_error = str(exc)
+            return False
+        self.last_error = None
+        previous, self.store = self.store, store
+        self.reloads += 1
+        changed = frozenset(ready)
+        for callback in self._callbacks:
+            callback(store, changed)
+        close_superseded(previous, store)
+        return True
+
+
+def reloader_from_env(store: ContentStore) -> ContentReloader:
+    return ContentReloader(store, enabled=os.environ.get("TERM_REALMS_HOT_RELOAD", "0") == "1")
@@ -0,0 +1,174 @@
+import json
+import mmap
+import re
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+# A JSON string (escapes included) or a bracket. Everything else is skipped by the regex engine,
+# so the Python side only sees the structure.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+
+# Checks one parsed record: (source, section, index, record), raising ValueError.
+RecordCheck = Callable[[str, str, int, Any], None]
+
+
+def _find_array(data: Any, source: str, key: str) -> int:
+    # Offset just past the '[' of the top-level `key` array.
+    wanted = json.dumps(key).encode("utf-8")
+    depth = 0
+    for match in _TOKEN.finditer(data):
+        token = match.group()
+        if token in (b"{", b"["):
+            depth += 1
+        elif token in (b"}", b"]"):
+            depth -= 1
+        elif depth == 1 and token == wanted:
+            rest = data[match.end() : match.end() + 64].lstrip()
+            if rest[:1] == b":":
+                value = rest[1:].lstrip()
+                if value[:1] != b"[":
+                    break
+                return data.find(b"[", match.end()) + 1
+    raise ValueError(f"{source}: expected an object with a '{key}' list")
+
+
+def _object_end(data: Any, source: str, start: int) -> int:
+    depth = 0
+    for match in _TOKEN.finditer(data, start):
+        token = match.group()
+        if token in (b"{", b"["):
+            depth += 1
+        elif token in (b"}", b"]"):
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError(f"{source}: unterminated record at byte {start}")
+
+
+def scan_offsets(data: Any, source: str, key: str) -> array:
+    # (start, end) byte offsets of every object in the top-level `key` array, interleaved.
+    offsets = array("q")
+    append = offsets.append
+    pos = _find_array(data, source, key)
+    separator = b""
+    while True:
+        start = data.find(b"{", pos)
+        gap = (data[pos:start] if start != -1 else data[pos:]).strip()
+        if gap != separator or start == -1:
+            # Anything but the separator between records must close the array.
+            if gap[:1] == b"]":
+                return offsets
+            if start == -1 and gap in (b"", separator):
+                raise ValueError(f"{source}: '{key}' list is not closed")
+            raise ValueError(f"{source}: {key}[{len(offsets) // 2}] must be an object")
+        # Most records are flat: no nested containers and no escapes. Then the first '}' that
+        # follows an even number of quotes closes the record, which find/count settle at C speed.
+        end = data.find(b"}", start) + 1
+        body = data[start + 1 : end]
+        if not end or b"{" in body or b"[" in body or b"\\" in body or body.count(b'"') % 2:
+            end = _object_end(data, source, start)
+        append(start)
+        append(end)
+        pos = end
+        separator = b","
+
+
+class LazyRecords(Sequence[dict[str, Any]]):
+    # One JSON array kept on disk: only the offset index lives in memory, and records are parsed
+    # and checked from a read-only memory map when indexed. The file must not change while this
+    # is in use, so data_loader hands it a private copy of the pack rather than the source.
+    _CACHE_SIZE = 256
+
+    def __init__(self, path: Path, source: str, section: str, check: RecordCheck, offsets: array) -> None:
+        self.path = path
+        self.source = source
+        self.section = section
+        self.check = check
+        self.offsets = offsets
+        self._map: mmap.mmap | None = None
+        self._cache: OrderedDict[int, dict[str, Any]] = OrderedDict()
+
+    @classmethod
+    def scan(cls, path: Path, source: str, section: str, check: RecordCheck) -> "LazyRecords":
+        with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offsets = scan_offsets(data, source, section)
+        return cls(path, source, section, check, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 2
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("record index out of range")
+        record = self._cache.get(index)
+        if record is not None:
+            self._cache.move_to_end(index)
+            return record
+        record = self._parse(index)
+        self._cache[index] = record
+        if len(self._cache) > self._CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return record
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        # Streams without touching the cache, so a full pass does not evict hot records.
+        for index in range(len(self)):
+            record = self._cache.get(index)
+            yield record if record is not None else self._parse(index)
+
+    def _parse(self, index: int) -> dict[str, Any]:
+        if self._map is None:
+            with self.path.open("rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        start = self.offsets[2 * index]
+        end = self.offsets[2 * index + 1]
+        try:
+            record = json.loads(self._map[start:end])
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ValueError(f"{self.source}: {self.section}[{index}] is invalid JSON ({exc})") from None
+        self.check(self.source, self.section, index, record)
+        return record
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._cache.clear()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "source": self.source,
+            "section": self.section,
+            "check": self.check,
+            "offsets": self.offsets,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)
+
+
+class LazyNameIndex(Mapping[str, dict[str, Any]]):
+    # name -> record for LazyRecords, over a name -> position table built when the pack is loaded.
+    def __init__(self, records: LazyRecords, positions: Mapping[str, int]) -> None:
+        self.records = records
+        self.positions = positions
+
+    def __getitem__(self, name: str) -> dict[str, Any]:
+        return self.records[self.positions[name]]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.positions)
+
+    def __len__(self) -> int:
+        return len(self.positions)
@@ -1,29 +1,416 @@
+import hashlib
 import json
+import os
+import pickle
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
+from .content_stream import LazyNameIndex, LazyRecords
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "data" / "stores"
 RESOURCE_DIR = PROJECT_ROOT / "resources"
+SNAPSHOT_PATH = PROJECT_ROOT / ".cache" / "content.snapshot"
+# Bump whenever the compiled ContentStore layout or validation rules change.
+SNAPSHOT_VERSION = 6
+# Monster files at least this large stay on disk and are parsed per record (see content_stream).
+LAZY_BYTES = 1024 * 1024
+# Lazy packs are mapped from a private copy here, named by content hash, never from the source.
+PACK_DIR = PROJECT_ROOT / ".cache" / "packs"
 
+# Field kinds accepted in the JSON stores; bools are never accepted as numbers.
+_KINDS: dict[str, tuple[type, ...]] = {"int": (int,), "number": (int, float), "string": (str,)}
 
-def _load_json(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as file:
-        return json.load(file)
+MONSTER_SCHEMA = {
+    "name": "string",
+    "hp": "int",
+    "strength": "int",
+    "defense": "int",
+    "speed": "int",
+    "xp_reward": "int",
+    "gold_reward": "int",
+}
+SKILL_SCHEMA = {"name": "string", "bonus_damage": "int", "accuracy": "number", "mp_cost": "int"}
+POTION_SCHEMA = {"name": "string", "price": "int", "stock_amount": "int", "description": "string"}
+WEAPON_SCHEMA = {"name": "string", "rarity": "string", "min_damage": "int", "max_damage": "int"}
 
 
-def load_monsters() -> list[dict[str, Any]]:
-    return _load_json(DATA_DIR / "monsters.json")["monsters"]
+@dataclass
+class ContentStore:
+    # Everything under data/stores and resources, validated and indexed once. Records are the
+    # JSON objects themselves and are shared, so callers must treat them as read-only.
+    monsters: Sequence[dict[str, Any]]
+    skills: dict[str, list[dict[str, Any]]]
+    potions: list[dict[str, Any]]
+    weapons: list[dict[str, Any]]
+    opening_lines: list[str]
+    encounters: dict[str, Any]
+    # Derived from `monsters` in one pass over them. replace() carries these over while the
+    # monsters stay the same; reload_sections resets them to None when the monsters change.
+    monster_index: dict[str, int] | None = None
+    monsters_by_name: Mapping[str, dict[str, Any]] | None = None
+    boss_template: dict[str, Any] | None = None
+    skills_by_name: dict[str, dict[str, Any]] = field(init=False)
+    potions_by_name: dict[str, dict[str, Any]] = field(init=False)
+    weapons_by_name: dict[str, dict[str, Any]] = field(init=False)
+    weapons_by_rarity: dict[str, list[dict[str, Any]]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.monster_index is None:
+            self.monster_index, self.boss_template = _index_monsters(self.monsters)
+            if isinstance(self.monsters, LazyRecords):
+                self.monsters_by_name = LazyNameIndex(self.monsters, self.monster_index)
+            else:
+                self.monsters_by_name = {monster["name"]: monster for monster in self.monsters}
+        self.skills_by_name = {skill["name"]: skill for skills in self.skills.values() for skill in skills}
+        self.potions_by_name = {potion["name"]: potion for potion in self.potions}
+        self.weapons_by_name = {weapon["name"]: weapon for weapon in self.weapons}
+        self.weapons_by_rarity = {}
+        for weapon in self.weapons:
+            self.weapons_by_rarity.setdefault(weapon["rarity"], []).append(weapon)
+        # Encounter weights name monsters from another file.
+        for table, weights in _encounter_tables(self.encounters):
+            for name in weights:
+                if name not in self.monster_index:
+                    source = _source_name(SOURCES["encounters"][0])
+                    raise ValueError(f"{source}: {table} names unknown monster {name!r}")
+
+    def skills_for(self, archetype: str) -> list[dict[str, Any]]:
+        return self.skills.get(archetype, [])
+
+
+def _source_name(path: Path) -> str:
+    try:
+        return str(path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def _check_records(source: str, section: str, records: Any, schema: dict[str, str]) -> list[dict[str, Any]]:
+    if not isinstance(records, list):
+        raise ValueError(f"{source}: '{section}' must be a list")
+    names: set[str] = set()
+    for index, record in enumerate(records):
+        _check_record(f"{source}: {section}[{index}]", record, schema)
+        if record["name"] in names:
+            raise ValueError(f"{source}: {section}[{index}] repeats the name {record['name']!r}")
+        names.add(record["name"])
+    return records
+
+
+def _check_record(where: str, record: Any, schema: dict[str, str]) -> None:
+    if not isinstance(record, dict):
+        raise ValueError(f"{where} must be an object")
+    for key, kind in schema.items():
+        if key not in record:
+            raise ValueError(f"{where} is missing '{key}'")
+        value = record[key]
+        if isinstance(value, bool) or not isinstance(value, _KINDS[kind]):
+            raise ValueError(f"{where}.{key} must be of type {kind}, got {value!r}")
+
+
+def _section(source: str, data: Any, key: str) -> Any:
+    if not isinstance(data, dict) or key not in data:
+        raise ValueError(f"{source}: expected an object with a '{key}' list")
+    return data[key]
+
+
+def _parse_monsters(source: str, data: Any) -> list[dict[str, Any]]:
+    monsters = _check_records(source, "monsters", _section(source, data, "monsters"), MONSTER_SCHEMA)
+    if not monsters:
+        raise ValueError(f"{source}: at least one monster is required")
+    for index, monster in enumerate(monsters):
+        _check_monster_stats(source, "monsters", index, monster)
+    return monsters
+
+
+def _check_monster(source: str, section: str, index: int, record: Any) -> None:
+    # Per-record check for lazily loaded monsters; duplicate names are caught by _index_monsters.
+    _check_record(f"{source}: {section}[{index}]", record, MONSTER_SCHEMA)
+    _check_monster_stats(source, section, index, record)
+
+
+def _boss_score(monster: dict[str, Any]) -> int:
+    return int(monster.get("hp", 1)) + int(monster.get("strength", 1)) * 3
+
+
+def _index_monsters(monsters: Sequence[dict[str, Any]]) -> tuple[dict[str, int], dict[str, Any]]:
+    # name -> position, and the boss template (the first monster with the highest _boss_score).
+    # For a lazy pack this is the one pass that parses and checks every record, without keeping
+    # them, so a bad record fails the load whatever the file size.
+    source = _source_name(SOURCES["monsters"][0])
+    positions: dict[str, int] = {}
+    boss: dict[str, Any] | None = None
+    best = 0
+    for index, monster in enumerate(monsters):
+        name = monster["name"]
+        if name in positions:
+            raise ValueError(f"{source}: monsters[{index}] repeats the name {name!r}")
+        positions[name] = index
+        score = _boss_score(monster)
+        if boss is None or score > best:
+            boss, best = monster, score
+    if boss is None:
+        raise ValueError(f"{source}: at least one monster is required")
+    return positions, boss
+
+
+def _check_monster_stats(source: str, section: str, index: int, monster: dict[str, Any]) -> None:
+    if monster["hp"] <= 0:
+        raise ValueError(f"{source}: {section}[{index}].hp must be positive")
+
+
+def _parse_skills(source: str, data: Any) -> dict[str, list[dict[str, Any]]]:
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected an object of class name -> skill list")
+    for archetype, skills in data.items():
+        _check_records(source, archetype, skills, SKILL_SCHEMA)
+        for index, skill in enumerate(skills):
+            if not 0.0 <= skill["accuracy"] <= 1.0:
+                raise ValueError(f"{source}: {archetype}[{index}].accuracy must be between 0 and 1")
+    return data
+
+
+def _parse_potions(source: str, data: Any) -> list[dict[str, Any]]:
+    potions = _check_records(source, "potions", _section(source, data, "potions"), POTION_SCHEMA)
+    for index, potion in enumerate(potions):
+        if potion["price"] < 0 or potion["stock_amount"] < 1:
+            raise ValueError(f"{source}: potions[{index}] needs price >= 0 and stock_amount >= 1")
+    return potions
+
+
+def _parse_weapons(source: str, data: Any) -> list[dict[str, Any]]:
+    weapons = _check_records(source, "weapons", _section(source, data, "weapons"), WEAPON_SCHEMA)
+    for index, weapon in enumerate(weapons):
+        if weapon["min_damage"] > weapon["max_damage"]:
+            raise ValueError(f"{source}: weapons[{index}].min_damage exceeds max_damage")
+    return weapons
+
+
+def _parse_opening_lines(source: str, data: Any) -> list[str]:
+    lines = _section(source, data, "opening_lines")
+    if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+        raise ValueError(f"{source}: 'opening_lines' must be a list of strings")
+    return lines
+
+
+def _check_weights(source: str, table: str, weights: Any) -> dict[str, int]:
+    if not isinstance(weights, dict):
+        raise ValueError(f"{source}: '{table}' must be an object of monster name -> weight")
+    for name, weight in weights.items():
+        if isinstance(weight, bool) or not isinstance(weight, int) or weight < 0:
+            raise ValueError(f"{source}: {table}.{name} must be a non-negative int, got {weight!r}")
+    return weights
+
+
+def _parse_encounters(source: str, data: Any) -> dict[str, Any]:
+    # Tier tables apply from their tier upward; biome tables apply on top of the tier's weights.
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected an object")
+    default = data.get("default_weight", 1)
+    if isinstance(default, bool) or not isinstance(default, int) or default < 0:
+        raise ValueError(f"{source}: 'default_weight' must be a non-negative int")
+    tiers = data.get("tiers", {})
+    biomes = data.get("biomes", {})
+    if not isinstance(tiers, dict) or not isinstance(biomes, dict):
+        raise ValueError(f"{source}: 'tiers' and 'biomes' must be objects")
+    by_tier: dict[int, dict[str, int]] = {}
+    for tier, weights in tiers.items():
+        if not tier.isdigit():
+            raise ValueError(f"{source}: tiers.{tier} must be keyed by a tier number")
+        by_tier[int(tier)] = _check_weights(source, f"tiers.{tier}", weights)
+    return {
+        "default_weight": default,
+        "weights": _check_weights(source, "weights", data.get("weights", {})),
+        "tiers": by_tier,
+        "biomes": {biome: _check_weights(source, f"biomes.{biome}", weights) for biome, weights in biomes.items()},
+    }
+
+
+def _encounter_tables(encounters: dict[str, Any]) -> Iterator[tuple[str, dict[str, int]]]:
+    yield "weights", encounters["weights"]
+    for tier, weights in encounters["tiers"].items():
+        yield f"tiers.{tier}", weights
+    for biome, weights in encounters["biomes"].items():
+        yield f"biomes.{biome}", weights
+
+
+# ContentStore field -> (source file, parser). Each file compiles on its own.
+SOURCES: dict[str, tuple[Path, Callable[[str, Any], Any]]] = {
+    "monsters": (DATA_DIR / "monsters.json", _parse_monsters),
+    "skills": (DATA_DIR / "skills.json", _parse_skills),
+    "potions": (DATA_DIR / "potions.json", _parse_potions),
+    "weapons": (DATA_DIR / "weapons.json", _parse_weapons),
+    "opening_lines": (RESOURCE_DIR / "opening_text.json", _parse_opening_lines),
+    "encounters": (DATA_DIR / "encounters.json", _parse_encounters),
+}
+
+
+def compile_section(name: str, raw: bytes) -> Any:
+    path, parse = SOURCES[name]
+    source = _source_name(path)
+    try:
+        data = json.loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"{source}: invalid JSON ({exc})") from None
+    return parse(source, data)
+
+
+def _compile_file(name: str, size: int, lazy_bytes: int | None) -> Any:
+    path, _ = SOURCES[name]
+    if name == "monsters" and lazy_bytes is not None and size >= lazy_bytes:
+        monsters = LazyRecords.scan(_pack_copy(path), _source_name(path), "monsters", _check_monster)
+        if not monsters:
+            raise ValueError(f"{_source_name(path)}: at least one monster is required")
+        return monsters
+    return compile_section(name, path.read_bytes())
+
+
+def _pack_copy(path: Path) -> Path:
+    # An editor rewriting the source in place would otherwise change the bytes under a live map
+    # (stale offsets, or SIGBUS once the file is truncated).
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        PACK_DIR.mkdir(parents=True, exist_ok=True)
+        temp = PACK_DIR / f"{path.stem}.{os.getpid()}.tmp"
+        with path.open("rb") as source, temp.open("wb") as target:
+            while chunk := source.read(1 << 20):
+                digest.update(chunk)
+                target.write(chunk)
+        copy = PACK_DIR / f"{path.stem}-{digest.hexdigest()}{path.suffix}"
+        if copy.exists():
+            temp.unlink()
+        else:
+            os.replace(temp, copy)
+    except OSError:
+        return path  # No writable cache: map the source itself.
+    return copy
+
+
+def _remove_packs(keep: Path | None) -> None:
+    for stale in PACK_DIR.glob("*.json"):
+        if stale != keep:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _fingerprint(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _digest(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+def _read_snapshot(path: Path) -> dict[str, Any] | None:
+    try:
+        with path.open("rb") as file:
+            snapshot = pickle.load(file)
+    except Exception:  # A missing, stale or corrupt snapshot only means compiling from source.
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    store = snapshot.get("store")
+    if not isinstance(store, ContentStore):
+        return None
+    if isinstance(store.monsters, LazyRecords) and not store.monsters.path.exists():
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, store: ContentStore, sources: dict[str, tuple[int, int, str]]) -> None:
+    snapshot = {"version": SNAPSHOT_VERSION, "sources": sources, "store": store}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_bytes(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(temp, path)
+    except OSError:
+        pass
+
+
+def load_content(snapshot_path: Path | None = SNAPSHOT_PATH, lazy_bytes: int | None = LAZY_BYTES) -> ContentStore:
+    # The snapshot is reused while every source keeps its (mtime, size); a file that was only
+    # touched is re-hashed, and the snapshot still counts if its content hash is unchanged.
+    # Invalid content raises ValueError naming the file and record. lazy_bytes=None loads eagerly.
+    snapshot = _read_snapshot(snapshot_path) if snapshot_path is not None else None
+    saved: dict[str, tuple[int, int, str]] = snapshot["sources"] if snapshot is not None else {}
+    stats = {name: _fingerprint(path) for name, (path, _) in SOURCES.items()}
+    if snapshot is not None and all(saved.get(name, ())[:2] == stat for name, stat in stats.items()):
+        return snapshot["store"]
+
+    sources = {name: (*stats[name], _digest(path)) for name, (path, _) in SOURCES.items()}
+    if snapshot is not None and all(saved.get(name, ())[2:] == (entry[2],) for name, entry in sources.items()):
+        store = snapshot["store"]
+    else:
+        store = ContentStore(**{name: _compile_file(name, stats[name][1], lazy_bytes) for name in SOURCES})
+        _remove_packs(store.monsters.path if isinstance(store.monsters, LazyRecords) else None)
+    if snapshot_path is not None:
+        _write_snapshot(snapshot_path, store, sources)
+    return store
+
+
+_content: ContentStore | None = None
+
+
+def content_store() -> ContentStore:
+    global _content
+    if _content is None:
+        _content = load_content()
+    return _content
+
+
+def reload_sections(store: ContentStore, names: Iterable[str], lazy_bytes: int | None = LAZY_BYTES) -> ContentStore:
+    # A new store with only `names` recompiled from their files; every other table is shared with
+    # `store`, which is left untouched. Raises ValueError like load_content, or OSError for a file
+    # that cannot be read, before anything changes.
+    global _content
+    sections = {name: _compile_file(name, _fingerprint(SOURCES[name][0])[1], lazy_bytes) for name in names}
+    if "monsters" in sections:
+        sections.update(monster_index=None, monsters_by_name=None, boss_template=None)
+    updated = replace(store, **sections)
+    if _content is store:
+        _content = updated
+    return updated
+
+
+def close_superseded(previous: ContentStore, current: ContentStore) -> None:
+    # Once nothing reads `previous` any more: closes its lazy monster pack and removes the copy.
+    records = previous.monsters
+    if records is current.monsters or not isinstance(records, LazyRecords):
+        return
+    records.close()
+    if records.path.parent == PACK_DIR and records.path != getattr(current.monsters, "path", None):
+        try:
+            records.path.unlink()
+        except OSError:
+            pass
+
+
+def load_monsters() -> Sequence[dict[str, Any]]:
+    return content_store().monsters
 
 
 def load_skills() -> dict[str, list[dict[str, Any]]]:
-    return _load_json(DATA_DIR / "skills.json")
+    return content_store().skills
 
 
 def load_potions() -> list[dict[str, Any]]:
-    return _load_json(DATA_DIR / "potions.json")["potions"]
+    return content_store().potions
+
+
+def load_weapons() -> list[dict[str, Any]]:
+    return content_store().weapons
 
 
 def load_opening_lines() -> list[str]:
-    return _load_json(RESOURCE_DIR / "opening_text.json")["opening_lines"]
+    return content_store().opening_lines
+
+
+def load_encounters() -> dict[str, Any]:
+    return content_store().encounters
@@ -0,0 +1,124 @@
+import curses
+
+BLANK = " "
+
+# A saved copy of the back buffer: (rows of chars, rows of attrs).
+FrameLayer = tuple[list[list[str]], list[list[int]]]
+
+
+class FrameBuffer:
+    # Retained-mode screen: draws land in a back buffer of (char, attr) cells and present()
+    # only sends curses the cells that differ from what is already on screen. The window size
+    # is read once per frame in begin(), and every put clips against that cached size.
+    def __init__(self) -> None:
+        self.height = 0
+        self.width = 0
+        self.last_writes = 0
+        self.last_cells = 0
+        self._chars: list[list[str]] = []
+        self._attrs: list[list[int]] = []
+        self._front_chars: list[list[str]] = []
+        self._front_attrs: list[list[int]] = []
+        self._front_valid = False
+
+    def begin(self, stdscr: curses.window) -> tuple[int, int]:
+        height, width = stdscr.getmaxyx()
+        if (height, width) != (self.height, self.width):
+            self.height = height
+            self.width = width
+            self._chars = [[BLANK] * width for _ in range(height)]
+            self._attrs = [[0] * width for _ in range(height)]
+            self._front_chars = [[BLANK] * width for _ in range(height)]
+            self._front_attrs = [[0] * width for _ in range(height)]
+            self._front_valid = False
+        else:
+            blank_chars = [BLANK] * width
+            blank_attrs = [0] * width
+            for row in self._chars:
+                row[:] = blank_chars
+            for row in self._attrs:
+                row[:] = blank_attrs
+        return height, width
+
+    def put(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        if y < 0 or y >= self.height or x >= self.width:
+            return
+        if x < 0:
+            text = text[-x:]
+            x = 0
+        text = text[: self.width - x]
+        if not text:
+            return
+        end = x + len(text)
+        self._chars[y][x:end] = text
+        self._attrs[y][x:end] = [attr] * len(text)
+
+    def put_cells(self, y: int, x: int, chars: str, attrs: list[int]) -> None:
+        if y < 0 or y >= self.height or x >= self.width:
+            return
+        if x < 0:
+            chars = chars[-x:]
+            attrs = attrs[-x:]
+            x = 0
+        count = min(len(chars), self.width - x)
+        if count <= 0:
+            return
+        self._chars[y][x : x + count] = chars[:count]
+        self._attrs[y][x : x + count] = attrs[:count]
+
+    def snapshot(self) -> FrameLayer:
+        return [row[:] for row in self._chars], [row[:] for row in self._attrs]
+
+    def restore(self, layer: FrameLayer) -> bool:
+        # Starts a frame from a saved layer instead of blanks; False if the size no longer matches.
+        chars, attrs = layer
+        if len(chars) != self.height or (chars and len(chars[0]) != self.width):
+            return False
+        for row, saved in zip(self._chars, chars):
+            row[:] = saved
+        for row, saved in zip(self._attrs, attrs):
+            row[:] = saved
+        return True
+
+    def invalidate(self) -> None:
+        # Something drew straight to the window, so the next present() repaints every cell.
+        self._front_valid = False
+
+    def present(self, stdscr: curses.window) -> None:
+        # The back buffer is left intact, so a frame can keep being drawn on after a present
+        # (the typewriter effect presents once per character).
+        writes = 0
+        cells = 0
+        width = self.width
+        valid = self._front_valid
+        for y in range(self.height):
+            chars = self._chars[y]
+            attrs = self._attrs[y]
+            front_chars = self._front_chars[y]
+            front_attrs = self._front_attrs[y]
+            if valid and chars == front_chars and attrs == front_attrs:
+                continue
+            x = 0
+            while x < width:
+                if valid and chars[x] == front_chars[x] and attrs[x] == front_attrs[x]:
+                    x += 1
+                    continue
+                attr = attrs[x]
+                start = x
+                x += 1
+                while x < width and attrs[x] == attr and not (
+                    valid and chars[x] == front_chars[x] and attrs[x] == front_attrs[x]
+                ):
+                    x += 1
+                try:
+                    stdscr.addstr(y, start, "".join(chars[start:x]), attr)
+                except curses.error:
+                    # Writing the bottom-right cell moves the cursor off-screen; the cell is still drawn.
+                    pass
+                writes += 1
+                cells += x - start
+            front_chars[:] = chars
+            front_attrs[:] = attrs
+        self._front_valid = True
+        self.last_writes = writes
+        self.last_cells = cells
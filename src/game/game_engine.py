@@ -5,20 +5,30 @@ import random
 import time
 from dataclasses import dataclass
 
-from .data_loader import load_monsters, load_opening_lines, load_potions, load_skills
+from .content_reload import reloader_from_env
+from .data_loader import ContentStore, content_store
+from .frame_buffer import FrameBuffer
+from .glyph_atlas import GlyphAtlas, build_atlas
 from .models import Monster, Player
+from .profiler import profiler_from_env
+from .rng import RngContext, seed_from_env
 from .systems.archer_training import start_archer_training
+from .systems.combat import (
+    ESCAPE_CHANCE,
+    POTION_HEAL,
+    roll_enemy_damage,
+    roll_player_damage,
+)
+from .systems.dungeon_cache import cache_from_env, generate_grid
+from .systems.dungeon_prefetch import DungeonPrefetcher
+from .systems.encounters import EncounterTable
 from .systems.meditation_training import start_meditation_training
 from .systems.warrior_training import start_warrior_training
-from .systems.map_generator import DungeonMap, TILE_DOOR, TILE_FLOOR
+from .systems.map_generator import DungeonGrid, DungeonMap, TILE_DOOR, TILE_FLOOR
+from .systems.monster_factory import MonsterFactory
+from .systems.stats import CLASS_TEMPLATES
 
 
-CLASS_TEMPLATES = {
-    "Warrior": {"hp": 120, "mp": 16, "strength": 16, "defense": 12, "speed": 8},
-    "Mage": {"hp": 85, "mp": 36, "strength": 18, "defense": 7, "speed": 10},
-    "Archer": {"hp": 95, "mp": 20, "strength": 14, "defense": 9, "speed": 14},
-}
-
 COMBAT_OPTIONS = ["Attack", "Skill", "Item", "Run"]
 CLASS_ART: dict[str, list[str]] = {
     "Warrior": [
@@ -126,7 +136,7 @@ ENEMY_ART: dict[str, list[str]] = {
 
 @dataclass
 class DungeonSession:
-    grid: list[list[int]]
+    grid: DungeonGrid
     player_x: int
     player_y: int
     exit_x: int
@@ -135,25 +145,57 @@ class DungeonSession:
     boss_pos: tuple[int, int] | None = None
     boss_defeated: bool = True
     message: str = "Explore carefully."
+    atlas: GlyphAtlas | None = None
+
+
+@dataclass
+class BackgroundLayer:
+    top: str
+    bottom: str
+    left: str
+    right: str
+    dots: list[tuple[int, int, str]]
 
 
 class GameEngine:
     def __init__(self) -> None:
         self.player: Player | None = None
-        self.monsters = load_monsters()
-        self.skills = load_skills()
-        self.potions = load_potions()
-        self.opening_lines = load_opening_lines()
-        self._bg_seed = random.randint(0, 999_999)
+        self._apply_content(content_store())
+        self._content_reloader = reloader_from_env(content_store())
+        self._content_reloader.subscribe(self._apply_content)
+        self.rng = RngContext(seed_from_env())
+        self._bg_seed = self.rng.stream("ui").randint(0, 999_999)
         self._typing_enabled = True
         self._typing_delay = 0.02
         self._typing_skip_until = 0.0
         self.dungeon_level = 1
+        self._dungeon_visits = 0
+        self._map_cache = cache_from_env()
+        self._dungeon_prefetch: DungeonPrefetcher[DungeonSession] = DungeonPrefetcher(self._build_dungeon_session)
         self._unicode_ui = os.environ.get("TERM_REALMS_ASCII", "0") != "1"
         self._monster_hit_flash_until = 0.0
+        self._frame = FrameBuffer()
+        self._profiler = profiler_from_env()
+        self._bg_layers: dict[tuple[int, int, int], BackgroundLayer] = {}
+
+    def _apply_content(self, store: ContentStore, changed: frozenset[str] = frozenset()) -> None:
+        self.monsters = store.monsters
+        self.skills = store.skills
+        self.potions = store.potions
+        self.opening_lines = store.opening_lines
+        # An empty `changed` is the initial load. Derived tables outlive reloads that leave
+        # their sources alone.
+        if not changed or changed & {"monsters", "encounters"}:
+            self._encounter_table = EncounterTable(store.monsters, store.monster_index, store.encounters)
+        if not changed or "monsters" in changed:
+            self._monster_factory = MonsterFactory(store.boss_template)
 
     def run(self) -> None:
-        curses.wrapper(self._run_curses)
+        try:
+            curses.wrapper(self._run_curses)
+        finally:
+            self._dungeon_prefetch.shutdown()
+            self._profiler.write_trace()
 
     def _run_curses(self, stdscr: curses.window) -> None:
         curses.curs_set(0)
@@ -219,15 +261,19 @@ class GameEngine:
             "Quit": "Leave this run and return to the start menu.",
         }
         while self.player.is_alive():
+            self._content_reloader.poll()
+            self._dungeon_prefetch.prefetch(self._dungeon_key(stdscr))
             option = self._menu_screen(
                 stdscr,
                 f"{self.player.name} the {self.player.archetype}",
                 ["Dungeon", "Market", "Training", "Status", "Quit"],
-                subtitle="Wander, grow, survive.",
+                subtitle=self._content_reloader.last_error or "Wander, grow, survive.",
                 status=self._status_line(),
                 info_map=menu_info,
                 context_tag="main",
             )
+            # Content swaps happen between screens, never while one is indexing the old tables.
+            self._content_reloader.poll()
 
             if option == 0:
                 self._dungeon_mode(stdscr)
@@ -242,48 +288,15 @@ class GameEngine:
 
     def _dungeon_mode(self, stdscr: curses.window) -> None:
         assert self.player is not None
-        frame_y, frame_x, frame_h, frame_w = self._frame_rect(stdscr)
-
-        map_w = max(24, min(56, frame_w - 8))
-        map_h = max(10, min(24, frame_h - 10))
-
-        dungeon = DungeonMap()
-        grid = dungeon.generate(width=map_w, height=map_h)
-
-        player_x, player_y = dungeon.random_floor_tile()
-        exit_x, exit_y = dungeon.random_floor_tile()
-        while (exit_x, exit_y) == (player_x, player_y):
-            exit_x, exit_y = dungeon.random_floor_tile()
-
-        occupied: set[tuple[int, int]] = {(player_x, player_y), (exit_x, exit_y)}
-        boss_pos: tuple[int, int] | None = None
-        if self.dungeon_level % 5 == 0:
-            boss_pos = self._generate_dungeon_boss_pos(dungeon, occupied)
-            if boss_pos is not None:
-                occupied.add(boss_pos)
-
-        treasures = self._generate_dungeon_treasures(
-            dungeon,
-            occupied=occupied,
-        )
-        session = DungeonSession(
-            grid,
-            player_x,
-            player_y,
-            exit_x,
-            exit_y,
-            treasures,
-            boss_pos=boss_pos,
-            boss_defeated=boss_pos is None,
-        )
-        session.grid[exit_y][exit_x] = TILE_DOOR
-        session.message = f"Dungeon Level {self.dungeon_level} | Treasures: {len(session.treasures)}"
-        if session.boss_pos is not None and not session.boss_defeated:
-            session.message += " | Boss: Hunt B before the door."
+        session = self._dungeon_prefetch.take(self._dungeon_key(stdscr))
+        self._dungeon_visits += 1
+        # Warm the level behind the door while this one is played; leaving early re-keys it.
+        self._dungeon_prefetch.prefetch(self._dungeon_key(stdscr, self.dungeon_level + 1))
 
         while self.player.is_alive():
+            self._content_reloader.poll()
             self._draw_dungeon(stdscr, session)
-            key = stdscr.getch()
+            key = self._read_key(stdscr)
             if key in (ord("q"), ord("Q"), 27):
                 return
 
@@ -297,9 +310,9 @@ class GameEngine:
             if (
                 nx < 0
                 or ny < 0
-                or ny >= len(session.grid)
-                or nx >= len(session.grid[0])
-                or not self._is_walkable_tile(session.grid[ny][nx])
+                or ny >= session.grid.height
+                or nx >= session.grid.width
+                or not self._is_walkable_tile(session.grid.get(nx, ny))
             ):
                 session.message = "A wall blocks your way."
                 continue
@@ -318,13 +331,13 @@ class GameEngine:
                 if not self._combat_mode(stdscr, boss, session):
                     return
                 session.boss_defeated = True
-                bounty = random.randint(25, 45)
+                bounty = self.rng.stream("loot").randint(25, 45)
                 self.player.gold += bounty
                 session.message = f"Boss defeated: {boss.name}. +{bounty} gold."
                 continue
 
             if (nx, ny) == (session.exit_x, session.exit_y):
-                bonus = random.randint(10, 22)
+                bonus = self.rng.stream("loot").randint(10, 22)
                 self.player.gold += bonus
                 self.dungeon_level += 1
                 self._toast(stdscr, f"Door reached. +{bonus} gold. Dungeon level {self.dungeon_level}.")
@@ -337,27 +350,66 @@ class GameEngine:
             if not self._dungeon_event(stdscr, session):
                 return
 
+    def _dungeon_key(self, stdscr: curses.window, level: int | None = None) -> tuple[int, int, int, int]:
+        _, _, frame_h, frame_w = self._frame_rect(stdscr)
+        map_w = max(24, min(56, frame_w - 8))
+        map_h = max(10, min(24, frame_h - 10))
+        return self._dungeon_visits, level or self.dungeon_level, map_w, map_h
+
+    def _build_dungeon_session(self, key: tuple[int, int, int, int]) -> DungeonSession:
+        # Runs on the prefetch thread: everything it draws comes from a fork keyed by the visit,
+        # so a prefetched level is identical to one built on entry.
+        visit, level, map_w, map_h = key
+        rng = self.rng.fork(f"dungeon/{visit}")
+        # Placement draws from its own stream so a cached grid yields the same level as a fresh one.
+        dungeon = DungeonMap(rng.stream("placement"))
+        with self._profiler.span("generate_map"):
+            grid = dungeon.use_grid(
+                generate_grid(rng.derive_seed("map"), width=map_w, height=map_h, cache=self._map_cache)
+            )
+
+        player_x, player_y = dungeon.random_floor_tile()
+        exit_x, exit_y = dungeon.random_floor_tile()
+        while (exit_x, exit_y) == (player_x, player_y):
+            exit_x, exit_y = dungeon.random_floor_tile()
+
+        occupied: set[tuple[int, int]] = {(player_x, player_y), (exit_x, exit_y)}
+        boss_pos: tuple[int, int] | None = None
+        if level % 5 == 0:
+            boss_pos = self._generate_dungeon_boss_pos(dungeon, occupied)
+            if boss_pos is not None:
+                occupied.add(boss_pos)
+
+        treasures = self._generate_dungeon_treasures(
+            dungeon,
+            occupied=occupied,
+            rng=rng.stream("loot"),
+        )
+        session = DungeonSession(
+            grid,
+            player_x,
+            player_y,
+            exit_x,
+            exit_y,
+            treasures,
+            boss_pos=boss_pos,
+            boss_defeated=boss_pos is None,
+        )
+        session.grid.set(exit_x, exit_y, TILE_DOOR)
+        session.message = f"Dungeon Level {level} | Treasures: {len(session.treasures)}"
+        if session.boss_pos is not None and not session.boss_defeated:
+            session.message += " | Boss: Hunt B before the door."
+        return session
+
     def _dungeon_event(self, stdscr: curses.window, session: DungeonSession) -> bool:
         assert self.player is not None
-        roll = random.random()
+        roll = self.rng.stream("encounter").random()
         if roll < 0.10:
-            template = self._pick_monster_template()
-            tier = self._difficulty_tier()
-            scaled_hp = max(1, int(round(template["hp"] * 0.75 * (1 + 0.15 * tier))))
-            scaled_strength = max(1, int(round(template["strength"] * (1 + 0.10 * tier))))
-            monster = Monster(
-                name=template["name"],
-                hp=scaled_hp,
-                strength=scaled_strength,
-                defense=template["defense"],
-                speed=template["speed"],
-                xp_reward=template["xp_reward"],
-                gold_reward=template["gold_reward"],
-            )
+            monster = self._monster_factory.encounter(self._pick_monster_template(), self._difficulty_tier())
             return self._combat_mode(stdscr, monster, session)
 
         if roll < 0.35:
-            found = random.randint(4, 12)
+            found = self.rng.stream("loot").randint(4, 12)
             self.player.gold += found
             session.message = f"You found {found} gold."
             return True
@@ -374,17 +426,14 @@ class GameEngine:
         return max(0, (self.dungeon_level - 1) // 5)
 
     def _pick_monster_template(self) -> dict:
-        weighted: list[dict] = []
-        for monster in self.monsters:
-            name = monster.get("name", "").lower()
-            copies = 1 if "slime" in name else 3
-            weighted.extend([monster] * copies)
-        return random.choice(weighted) if weighted else random.choice(self.monsters)
+        # The dungeon has no biomes yet, so only the tier tables apply.
+        return self._encounter_table.pick(self.rng.stream("encounter"), self._difficulty_tier())
 
     def _generate_dungeon_treasures(
         self,
         dungeon: DungeonMap,
         occupied: set[tuple[int, int]],
+        rng: random.Random,
     ) -> dict[tuple[int, int], str]:
         loot_pool = [
             "Iron Sword",
@@ -394,7 +443,7 @@ class GameEngine:
             "Potion Cache",
             "Gold Satchel",
         ]
-        count = random.randint(2, 4)
+        count = rng.randint(2, 4)
         treasures: dict[tuple[int, int], str] = {}
         attempts = 0
         while len(treasures) < count and attempts < 220:
@@ -402,7 +451,7 @@ class GameEngine:
             tx, ty = dungeon.random_floor_tile()
             if (tx, ty) in occupied or (tx, ty) in treasures:
                 continue
-            treasures[(tx, ty)] = random.choice(loot_pool)
+            treasures[(tx, ty)] = rng.choice(loot_pool)
         return treasures
 
     def _generate_dungeon_boss_pos(
@@ -420,24 +469,7 @@ class GameEngine:
         return None
 
     def _create_dungeon_boss(self) -> Monster:
-        template = max(
-            self.monsters,
-            key=lambda m: int(m.get("hp", 1)) + int(m.get("strength", 1)) * 3,
-        )
-        tier = self._difficulty_tier()
-        hp = max(1, int(round(template["hp"] * 1.8 * (1 + 0.18 * tier))))
-        strength = max(1, int(round(template["strength"] * (1 + 0.20 * tier))))
-        defense = max(1, int(round(template["defense"] * (1 + 0.15 * tier))))
-        speed = max(1, int(round(template["speed"] * (1 + 0.08 * tier))))
-        return Monster(
-            name=f"Boss {template['name']}",
-            hp=hp,
-            strength=strength,
-            defense=defense,
-            speed=speed,
-            xp_reward=max(1, int(round(template["xp_reward"] * 2.0))),
-            gold_reward=max(1, int(round(template["gold_reward"] * 2.0))),
-        )
+        return self._monster_factory.boss(self._difficulty_tier())
 
     def _collect_dungeon_treasure(self, session: DungeonSession, pos: tuple[int, int]) -> str:
         assert self.player is not None
@@ -460,12 +492,12 @@ class GameEngine:
             self.player.defense += 2
             return "Treasure found: Guardian Charm. +2 DEF."
         if loot == "Potion Cache":
-            add = random.randint(1, 2)
+            add = self.rng.stream("loot").randint(1, 2)
             self.player.potions += add
             healed = self.player.heal(12)
             return f"Treasure found: Potion Cache. +{add} potion(s), +{healed} HP."
 
-        gold = random.randint(12, 28)
+        gold = self.rng.stream("loot").randint(12, 28)
         self.player.gold += gold
         return f"Treasure found: Gold Satchel. +{gold} gold."
 
@@ -473,6 +505,7 @@ class GameEngine:
         assert self.player is not None
         self._monster_hit_flash_until = 0.0
         log: list[str] = []
+        rng = self.rng.stream("combat")
         class_skills = self.skills.get(self.player.archetype, [])
         selected = 0
         self._append_combat_log_typed(
@@ -481,7 +514,7 @@ class GameEngine:
 
         while self.player.is_alive() and monster.is_alive():
             self._draw_combat(stdscr, monster, log, session, selected)
-            key = stdscr.getch()
+            key = self._read_key(stdscr)
 
             moved, selected = self._move_combat_selection(selected, key)
             if moved:
@@ -500,7 +533,7 @@ class GameEngine:
                 )
             elif action == "Skill":
                 if class_skills:
-                    skill = random.choice(class_skills)
+                    skill = rng.choice(class_skills)
                     mp_cost = int(skill.get("mp_cost", 0))
                     is_mage = self.player.archetype == "Mage"
                     if is_mage and not self.player.spend_mp(mp_cost):
@@ -512,7 +545,7 @@ class GameEngine:
                             log,
                             f"Not enough MP for {skill['name']} ({mp_cost} MP).",
                         )
-                    elif random.random() <= skill["accuracy"]:
+                    elif rng.random() <= skill["accuracy"]:
                         dmg, attack_note = self._roll_player_damage(
                             self.player.strength,
                             monster.defense,
@@ -540,7 +573,7 @@ class GameEngine:
             elif action == "Item":
                 if self.player.potions > 0:
                     self.player.potions -= 1
-                    healed = self.player.heal(25)
+                    healed = self.player.heal(POTION_HEAL)
                     self._append_combat_log_typed(
                         stdscr, monster, session, selected, log, f"Potion used. +{healed} HP."
                     )
@@ -549,7 +582,7 @@ class GameEngine:
                         stdscr, monster, session, selected, log, "No potions left."
                     )
             elif action == "Run":
-                if random.random() < 0.35:
+                if rng.random() < ESCAPE_CHANCE:
                     self._toast(stdscr, "You escaped the battle.")
                     return True
                 self._append_combat_log_typed(
@@ -616,7 +649,9 @@ class GameEngine:
                 stdscr,
                 "Mage Training: move @ with W/A/S/D, avoid x/o, preserve Focus, Q to exit.",
             )
-            result = start_meditation_training(stdscr, self.player)
+            result = start_meditation_training(
+                stdscr, self.player, self.rng.stream("trainer.meditation"), self._frame, self._profiler
+            )
             self.player.hp = max(1, self.player.hp - result.hp_cost)
             self.player.speed += result.speed_gain
             leveled = self.player.gain_xp(result.xp_gain)
@@ -630,7 +665,9 @@ class GameEngine:
                 stdscr,
                 "Warrior Training: W(up) S(down) A(left) D(right) to parry incoming strikes.",
             )
-            result = start_warrior_training(stdscr, self.player)
+            result = start_warrior_training(
+                stdscr, self.player, self.rng.stream("trainer.warrior"), self._frame, self._profiler
+            )
             self.player.hp = max(1, self.player.hp - result.hp_cost)
             self.player.strength += result.strength_gain
             self.player.defense += result.defense_gain
@@ -645,7 +682,9 @@ class GameEngine:
                 stdscr,
                 "Archer Training: W/S move, hold/release SPACE to shoot right, hit moving o targets.",
             )
-            result = start_archer_training(stdscr, self.player)
+            result = start_archer_training(
+                stdscr, self.player, self.rng.stream("trainer.archer"), self._frame, self._profiler
+            )
             self.player.hp = max(1, self.player.hp - result.hp_cost)
             self.player.speed += result.speed_gain
             leveled = self.player.gain_xp(result.xp_gain)
@@ -655,9 +694,10 @@ class GameEngine:
             self._toast(stdscr, msg)
             return
 
-        hp_cost = random.randint(4, 10)
-        xp_gain = random.randint(20, 40)
-        speed_gain = 1 if random.random() < 0.3 else 0
+        rng = self.rng.stream("training")
+        hp_cost = rng.randint(4, 10)
+        xp_gain = rng.randint(20, 40)
+        speed_gain = 1 if rng.random() < 0.3 else 0
 
         self.player.hp = max(1, self.player.hp - hp_cost)
         self.player.strength += 1
@@ -718,9 +758,9 @@ class GameEngine:
                 "Character status overview.",
                 "Press Q, ESC, or Enter to return.",
             )
-            stdscr.refresh()
+            self._present(stdscr)
             animated = True
-            key = stdscr.getch()
+            key = self._read_key(stdscr)
             if key in (ord("q"), ord("Q"), 27, curses.KEY_ENTER, 10, 13):
                 return
 
@@ -801,9 +841,9 @@ class GameEngine:
                 "W/S or arrows move | Hover to preview | Left click or Enter to select"[: frame_w - 4],
                 self._c(1) | curses.A_BOLD,
             )
-            stdscr.refresh()
+            self._present(stdscr)
 
-            key = stdscr.getch()
+            key = self._read_key(stdscr)
             if key in (curses.KEY_UP, ord("w"), ord("W")):
                 idx = (idx - 1) % len(options)
             elif key in (curses.KEY_DOWN, ord("s"), ord("S")):
@@ -871,9 +911,9 @@ class GameEngine:
             shown = name if name else "_"
             self._safe_addstr(stdscr, frame_y + 5, frame_x + 6, shown[: frame_w - 10], self._c(5) | curses.A_BOLD)
             self._safe_addstr(stdscr, frame_y + frame_h - 2, frame_x + 2, "Backspace to delete", self._c(2))
-            stdscr.refresh()
+            self._present(stdscr)
 
-            key = stdscr.getch()
+            key = self._read_key(stdscr)
             if key in (10, 13, curses.KEY_ENTER) and name.strip():
                 return name.strip()
             if key in (curses.KEY_BACKSPACE, 127, 8):
@@ -1030,9 +1070,9 @@ class GameEngine:
                     dialog_text,
                     "Arrow keys/W/S to move | Enter to confirm",
                 )
-                stdscr.refresh()
+                self._present(stdscr)
 
-                key = stdscr.getch()
+                key = self._read_key(stdscr)
                 if key in (curses.KEY_UP, ord("w"), ord("W")):
                     idx = (idx - 1) % len(options)
                 elif key in (curses.KEY_DOWN, ord("s"), ord("S")):
@@ -1078,8 +1118,8 @@ class GameEngine:
         frame_y, frame_x, frame_h, frame_w = self._frame_rect(stdscr)
         self._draw_panel(stdscr, frame_y, frame_x, frame_h, frame_w, "DUNGEON CRAWL")
 
-        map_h = len(session.grid)
-        map_w = len(session.grid[0])
+        map_h = session.grid.height
+        map_w = session.grid.width
         map_x = frame_x + max(2, (frame_w - map_w) // 2)
         map_y = frame_y + 2
         max_map_y = frame_y + frame_h - 9
@@ -1088,16 +1128,11 @@ class GameEngine:
 
         self._draw_map(
             stdscr,
-            session.grid,
+            session,
             map_y,
             map_x,
             map_h,
             map_w,
-            (session.player_x, session.player_y),
-            (session.exit_x, session.exit_y),
-            set(session.treasures.keys()),
-            session.boss_pos,
-            session.boss_defeated,
         )
 
         self._safe_addstr(
@@ -1116,7 +1151,7 @@ class GameEngine:
             f"{session.message} | Treasures left: {len(session.treasures)}",
             "Move W/A/S/D or arrows | Q to leave dungeon.",
         )
-        stdscr.refresh()
+        self._present(stdscr)
 
     def _draw_combat(
         self,
@@ -1139,7 +1174,7 @@ class GameEngine:
 
         content_y = frame_y + 2
         content_h = frame_h - 9
-        left_w = min(len(session.grid[0]) + 2, max(26, frame_w // 2))
+        left_w = min(session.grid.width + 2, max(26, frame_w // 2))
         left_w = min(left_w, frame_w - 8)
         left_x = frame_x + 2
 
@@ -1164,16 +1199,11 @@ class GameEngine:
         map_w = max(10, left_w - 2)
         self._draw_map(
             stdscr,
-            session.grid,
+            session,
             map_y,
             map_x,
             map_h,
             map_w,
-            (session.player_x, session.player_y),
-            (session.exit_x, session.exit_y),
-            set(session.treasures.keys()),
-            session.boss_pos,
-            session.boss_defeated,
         )
 
         text_x = center_x + 2
@@ -1272,7 +1302,7 @@ class GameEngine:
             latest,
             "W/A/S/D or arrows move | Enter confirm",
         )
-        stdscr.refresh()
+        self._present(stdscr)
 
     def _draw_boss_combat(
         self,
@@ -1365,7 +1395,7 @@ class GameEngine:
             latest,
             "W/A/S/D or arrows move | Enter confirm",
         )
-        stdscr.refresh()
+        self._present(stdscr)
 
     def _draw_header_art(
         self,
@@ -1406,56 +1436,74 @@ class GameEngine:
                 self._safe_addstr(stdscr, i, frame_x + 4, line, self._c(6))
 
     def _draw_background(self, stdscr: curses.window, phase: int) -> None:
-        stdscr.erase()
-        max_y, max_x = stdscr.getmaxyx()
+        # Every screen starts its frame here, so this opens the "draw" span that _present closes.
+        self._profiler.begin("draw")
+        with self._profiler.span("draw_background"):
+            max_y, max_x = self._frame.begin(stdscr)
+            layer = self._background_layer(max_y, max_x, phase)
+            border_attr = self._c(1)
+            self._frame.put(0, 0, layer.top, border_attr)
+            self._frame.put(max_y - 1, 0, layer.bottom, border_attr)
+            for y in range(max_y):
+                self._frame.put(y, 0, layer.left[y], border_attr)
+                self._frame.put(y, max_x - 1, layer.right[y], border_attr)
+
+            color = self._c(7) | curses.A_DIM
+            for y, x, ch in layer.dots:
+                self._frame.put(y, x, ch, color)
+
+    def _background_layer(self, max_y: int, max_x: int, phase: int) -> BackgroundLayer:
+        key = (max_y, max_x, phase)
+        layer = self._bg_layers.get(key)
+        if layer is not None:
+            return layer
+        if any(size != (max_y, max_x) for size in ((k[0], k[1]) for k in self._bg_layers)):
+            self._bg_layers.clear()
+
         glyphs = ".:."
-        border_attr = self._c(1)
-        for x in range(max_x):
-            top = glyphs[(x * 5 + phase + self._bg_seed) % len(glyphs)]
-            bot = glyphs[(x * 7 + phase + self._bg_seed) % len(glyphs)]
-            self._safe_addstr(stdscr, 0, x, top, border_attr)
-            self._safe_addstr(stdscr, max_y - 1, x, bot, border_attr)
-        for y in range(max_y):
-            left = glyphs[(y * 3 + phase + self._bg_seed) % len(glyphs)]
-            right = glyphs[(y * 11 + phase + self._bg_seed) % len(glyphs)]
-            self._safe_addstr(stdscr, y, 0, left, border_attr)
-            self._safe_addstr(stdscr, y, max_x - 1, right, border_attr)
-
-        for y in range(max_y):
-            for x in range(max_x):
-                if x in (0, max_x - 1) or y in (0, max_y - 1):
-                    continue
-                if ((x * 19 + y * 23 + phase + self._bg_seed) % 113) != 0:
-                    continue
-                ch = glyphs[(x + y + phase) % len(glyphs)]
-                color = self._c(7) | curses.A_DIM
-                self._safe_addstr(stdscr, y, x, ch, color)
+        offset = phase + self._bg_seed
+        dots: list[tuple[int, int, str]] = []
+        for y in range(1, max_y - 1):
+            for x in range(1, max_x - 1):
+                if ((x * 19 + y * 23 + offset) % 113) == 0:
+                    dots.append((y, x, glyphs[(x + y + phase) % len(glyphs)]))
+        layer = BackgroundLayer(
+            top="".join(glyphs[(x * 5 + offset) % len(glyphs)] for x in range(max_x)),
+            bottom="".join(glyphs[(x * 7 + offset) % len(glyphs)] for x in range(max_x)),
+            left="".join(glyphs[(y * 3 + offset) % len(glyphs)] for y in range(max_y)),
+            right="".join(glyphs[(y * 11 + offset) % len(glyphs)] for y in range(max_y)),
+            dots=dots,
+        )
+        self._bg_layers[key] = layer
+        return layer
 
     def _draw_panel(self, stdscr: curses.window, y: int, x: int, h: int, w: int, title: str = "") -> None:
-        max_y, max_x = stdscr.getmaxyx()
+        max_y, max_x = self._frame.height, self._frame.width
         if h < 3 or w < 4:
             return
         y2 = min(max_y - 1, y + h - 1)
         x2 = min(max_x - 1, x + w - 1)
 
+        fill = " " * max(0, x2 - x - 1)
+        fill_attr = self._ui_fill()
+        vline = self._g("v")
         for yy in range(y + 1, y2):
-            for xx in range(x + 1, x2):
-                self._safe_addstr(stdscr, yy, xx, " ", self._ui_fill())
+            self._frame.put(yy, x + 1, fill, fill_attr)
 
         hline = self._g("h") * max(0, x2 - x - 1)
-        self._safe_addstr(stdscr, y, x + 1, hline, self._c(1))
-        self._safe_addstr(stdscr, y2, x + 1, hline, self._c(1))
+        self._frame.put(y, x + 1, hline, self._c(1))
+        self._frame.put(y2, x + 1, hline, self._c(1))
         for yy in range(y + 1, y2):
-            self._safe_addstr(stdscr, yy, x, self._g("v"), self._c(1))
-            self._safe_addstr(stdscr, yy, x2, self._g("v"), self._c(1))
-        self._safe_addstr(stdscr, y, x, self._g("tl"), self._c(3))
-        self._safe_addstr(stdscr, y, x2, self._g("tr"), self._c(3))
-        self._safe_addstr(stdscr, y2, x, self._g("bl"), self._c(3))
-        self._safe_addstr(stdscr, y2, x2, self._g("br"), self._c(3))
+            self._frame.put(yy, x, vline, self._c(1))
+            self._frame.put(yy, x2, vline, self._c(1))
+        self._frame.put(y, x, self._g("tl"), self._c(3))
+        self._frame.put(y, x2, self._g("tr"), self._c(3))
+        self._frame.put(y2, x, self._g("bl"), self._c(3))
+        self._frame.put(y2, x2, self._g("br"), self._c(3))
 
         if title:
             title_text = f" {title} "
-            self._safe_addstr(stdscr, y, x + 2, title_text[: max(0, x2 - x - 3)], self._c(3) | curses.A_BOLD)
+            self._frame.put(y, x + 2, title_text[: max(0, x2 - x - 3)], self._c(3) | curses.A_BOLD)
 
     def _draw_dialog_box(
         self,
@@ -1491,43 +1539,44 @@ class GameEngine:
     def _draw_map(
         self,
         stdscr: curses.window,
-        grid: list[list[int]],
+        session: DungeonSession,
         draw_y: int,
         draw_x: int,
         max_h: int,
         max_w: int,
-        player_pos: tuple[int, int],
-        exit_pos: tuple[int, int],
-        treasure_positions: set[tuple[int, int]] | None = None,
-        boss_pos: tuple[int, int] | None = None,
-        boss_defeated: bool = True,
     ) -> None:
-        player_x, player_y = player_pos
-        exit_x, exit_y = exit_pos
-        treasure_positions = treasure_positions or set()
-        for y in range(min(max_h, len(grid))):
-            for x in range(min(max_w, len(grid[0]))):
-                tile = grid[y][x]
-                ch = self._tile_char(grid, x, y, tile)
-                if tile == TILE_FLOOR:
-                    color = self._c(5) | curses.A_DIM
-                elif tile == TILE_DOOR:
-                    color = self._c(3) | curses.A_BOLD
-                else:
-                    color = self._c(1) | curses.A_BOLD
-                if (x, y) in treasure_positions:
-                    ch = "T" if not self._unicode_ui else "✦"
-                    color = self._c(3) | curses.A_BOLD
-                if (x, y) == boss_pos and not boss_defeated:
-                    ch = "B"
-                    color = self._c(4) | curses.A_BOLD
-                if (x, y) == (exit_x, exit_y):
-                    ch = "D"
-                    color = self._c(3) | curses.A_BOLD
-                if (x, y) == (player_x, player_y):
-                    ch = "@"
-                    color = self._c(4) | curses.A_BOLD
-                self._safe_addstr(stdscr, draw_y + y, draw_x + x, ch, color)
+        with self._profiler.span("draw_map"):
+            atlas = self._map_atlas(session)
+            rows = min(max_h, session.grid.height)
+            cols = min(max_w, session.grid.width)
+            for y in range(rows):
+                self._put_cells(stdscr, draw_y + y, draw_x, atlas.chars[y][:cols], atlas.attrs[y][:cols])
+
+            overlays: list[tuple[tuple[int, int], str, int]] = []
+            treasure_glyph = "T" if not self._unicode_ui else "✦"
+            for pos in session.treasures:
+                overlays.append((pos, treasure_glyph, self._c(3) | curses.A_BOLD))
+            if session.boss_pos is not None and not session.boss_defeated:
+                overlays.append((session.boss_pos, "B", self._c(4) | curses.A_BOLD))
+            overlays.append(((session.exit_x, session.exit_y), "D", self._c(3) | curses.A_BOLD))
+            overlays.append(((session.player_x, session.player_y), "@", self._c(4) | curses.A_BOLD))
+            for (x, y), ch, color in overlays:
+                if 0 <= x < cols and 0 <= y < rows:
+                    self._safe_addstr(stdscr, draw_y + y, draw_x + x, ch, color)
+
+    def _map_atlas(self, session: DungeonSession) -> GlyphAtlas:
+        atlas = session.atlas
+        if atlas is None or atlas.version != session.grid.version:
+            atlas = build_atlas(
+                session.grid,
+                self._bg_seed,
+                self._unicode_ui,
+                floor_attr=self._c(5) | curses.A_DIM,
+                wall_attr=self._c(1) | curses.A_BOLD,
+                door_attr=self._c(3) | curses.A_BOLD,
+            )
+            session.atlas = atlas
+        return atlas
 
     def _frame_rect(self, stdscr: curses.window) -> tuple[int, int, int, int]:
         max_y, max_x = stdscr.getmaxyx()
@@ -1581,59 +1630,6 @@ class GameEngine:
             f"Dungeon {self.dungeon_level}"
         )
 
-    def _tile_char(self, grid: list[list[int]], x: int, y: int, tile: int) -> str:
-        if tile == TILE_DOOR:
-            return "D"
-        if tile == TILE_FLOOR:
-            if not self._unicode_ui:
-                return "." if ((x * 5 + y * 3 + self._bg_seed) % 9) else ","
-            if ((x * 7 + y * 11 + self._bg_seed) % 31) == 0:
-                return "✧"
-            if ((x * 3 + y * 5 + self._bg_seed) % 17) == 0:
-                return "⋅"
-            return "·"
-        if not self._unicode_ui:
-            return "#"
-        return self._wall_glyph(grid, x, y)
-
-    def _wall_glyph(self, grid: list[list[int]], x: int, y: int) -> str:
-        h = len(grid)
-        w = len(grid[0]) if h else 0
-
-        def is_wall(nx: int, ny: int) -> bool:
-            if nx < 0 or ny < 0 or nx >= w or ny >= h:
-                return True
-            return grid[ny][nx] != TILE_FLOOR
-
-        n = is_wall(x, y - 1)
-        s = is_wall(x, y + 1)
-        e = is_wall(x + 1, y)
-        wv = is_wall(x - 1, y)
-
-        if n and s and e and wv:
-            return "█"
-        if n and s and not e and not wv:
-            return "│"
-        if not n and not s and e and wv:
-            return "─"
-        if n and e and not s and not wv:
-            return "└"
-        if n and wv and not s and not e:
-            return "┘"
-        if s and e and not n and not wv:
-            return "┌"
-        if s and wv and not n and not e:
-            return "┐"
-        if n and s and e and not wv:
-            return "├"
-        if n and s and wv and not e:
-            return "┤"
-        if n and e and wv and not s:
-            return "┴"
-        if s and e and wv and not n:
-            return "┬"
-        return "▓"
-
     def _is_walkable_tile(self, tile: int) -> bool:
         return tile in (TILE_FLOOR, TILE_DOOR)
 
@@ -1649,7 +1645,7 @@ class GameEngine:
         return 0, 0
 
     def _roll_damage(self, attacker_strength: int, defender_defense: int, bonus: int = 0) -> int:
-        variance = random.randint(-2, 3)
+        variance = self.rng.stream("combat").randint(-2, 3)
         raw = attacker_strength + bonus + variance
         mitigation = defender_defense // 2
         return max(1, raw - mitigation)
@@ -1660,27 +1656,14 @@ class GameEngine:
         defender_defense: int,
         bonus: int = 0,
     ) -> tuple[int, str]:
-        crit = random.random() < 0.15
-        variance = random.randint(-1, 4)
-        raw = attacker_strength + bonus + variance + (4 if crit else 0)
-        mitigation = defender_defense // 2
-        damage = max(1, raw - mitigation)
-        return damage, ("Critical strike!" if crit else "")
+        return roll_player_damage(attacker_strength, defender_defense, bonus, self.rng.stream("combat"))
 
     def _roll_enemy_damage(
         self,
         attacker_strength: int,
         defender_defense: int,
     ) -> tuple[int, str]:
-        wild = random.randint(-4, 6)
-        raw = attacker_strength + wild
-        mitigation = defender_defense // 3
-        damage = max(1, raw - mitigation)
-        if wild >= 5:
-            return damage, "Heavy blow!"
-        if wild <= -3:
-            return damage, "Glancing hit."
-        return damage, ""
+        return roll_enemy_damage(attacker_strength, defender_defense, self.rng.stream("combat"))
 
     def _draw_status_box(
         self,
@@ -1794,7 +1777,7 @@ class GameEngine:
         end = time.monotonic() + max(0.08, duration)
         while time.monotonic() < end:
             self._draw_combat(stdscr, monster, log, session, selected)
-            time.sleep(0.04)
+            self._sleep(0.04)
 
     def _combat_log_coords(
         self,
@@ -1817,7 +1800,7 @@ class GameEngine:
         frame_y, frame_x, frame_h, frame_w = self._frame_rect(stdscr)
         content_y = frame_y + 2
         content_h = frame_h - 9
-        left_w = min(len(session.grid[0]) + 2, max(26, frame_w // 2))
+        left_w = min(session.grid.width + 2, max(26, frame_w // 2))
         left_w = min(left_w, frame_w - 8)
         left_x = frame_x + 2
 
@@ -1863,8 +1846,8 @@ class GameEngine:
             "Press any key to continue."[: card_w - 4],
             self._c(3) | curses.A_BOLD,
         )
-        stdscr.refresh()
-        stdscr.getch()
+        self._present(stdscr)
+        self._read_key(stdscr)
 
     def _typewriter_draw(
         self,
@@ -1878,11 +1861,11 @@ class GameEngine:
             return
         if not self._typing_enabled:
             self._safe_addstr(stdscr, y, x, text, attr)
-            stdscr.refresh()
+            self._present(stdscr)
             return
         if time.monotonic() < self._typing_skip_until:
             self._safe_addstr(stdscr, y, x, text, attr)
-            stdscr.refresh()
+            self._present(stdscr)
             return
 
         stdscr.nodelay(True)
@@ -1892,48 +1875,53 @@ class GameEngine:
                 if self._is_skip_pressed(stdscr):
                     self._typing_skip_until = time.monotonic() + 0.6
                     self._safe_addstr(stdscr, y, x, text, attr)
-                    stdscr.refresh()
+                    self._present(stdscr)
                     return
 
                 rendered += ch
                 self._safe_addstr(stdscr, y, x, rendered, attr)
-                stdscr.refresh()
+                self._present(stdscr)
 
                 sleep_steps = max(1, int(self._typing_delay / 0.005))
                 for _ in range(sleep_steps):
                     if self._is_skip_pressed(stdscr):
                         self._typing_skip_until = time.monotonic() + 0.6
                         self._safe_addstr(stdscr, y, x, text, attr)
-                        stdscr.refresh()
+                        self._present(stdscr)
                         return
-                    time.sleep(0.005)
+                    self._sleep(0.005)
         finally:
             stdscr.nodelay(False)
 
     def _is_skip_pressed(self, stdscr: curses.window) -> bool:
         while True:
-            key = stdscr.getch()
+            key = self._read_key(stdscr)
             if key == -1:
                 return False
             if key in (10, 13, curses.KEY_ENTER):
                 return True
 
+    def _put_cells(self, stdscr: curses.window, y: int, x: int, chars: str, attrs: list[int]) -> None:
+        self._frame.put_cells(y, x, chars, attrs)
+
     def _safe_addstr(self, stdscr: curses.window, y: int, x: int, text: str, attr: int = 0) -> None:
-        max_y, max_x = stdscr.getmaxyx()
-        if y < 0 or y >= max_y or x >= max_x:
-            return
-        if x < 0:
-            text = text[-x:]
-            x = 0
-        if not text:
-            return
-        clipped = text[: max_x - x]
-        if not clipped:
-            return
-        try:
-            stdscr.addstr(y, x, clipped, attr)
-        except curses.error:
-            pass
+        self._frame.put(y, x, text, attr)
+
+    def _present(self, stdscr: curses.window) -> None:
+        self._profiler.end("draw")
+        with self._profiler.span("refresh"):
+            self._profiler.draw_overlay(self._frame)
+            self._frame.present(stdscr)
+            stdscr.refresh()
+        self._profiler.frame()
+
+    def _read_key(self, stdscr: curses.window) -> int:
+        with self._profiler.span("input"):
+            return stdscr.getch()
+
+    def _sleep(self, seconds: float) -> None:
+        with self._profiler.span("sleep"):
+            time.sleep(seconds)
 
     def _c(self, pair_id: int) -> int:
         if not curses.has_colors():
@@ -0,0 +1,93 @@
+from .systems.map_generator import TILE_DOOR, TILE_FLOOR, DungeonGrid
+
+# Neighbour mask bits: a set bit means that side is wall (or off the map).
+WALL_N = 1
+WALL_S = 2
+WALL_E = 4
+WALL_W = 8
+
+WALL_GLYPHS = ["▓"] * 16
+WALL_GLYPHS[WALL_N | WALL_S | WALL_E | WALL_W] = "█"
+WALL_GLYPHS[WALL_N | WALL_S] = "│"
+WALL_GLYPHS[WALL_E | WALL_W] = "─"
+WALL_GLYPHS[WALL_N | WALL_E] = "└"
+WALL_GLYPHS[WALL_N | WALL_W] = "┘"
+WALL_GLYPHS[WALL_S | WALL_E] = "┌"
+WALL_GLYPHS[WALL_S | WALL_W] = "┐"
+WALL_GLYPHS[WALL_N | WALL_S | WALL_E] = "├"
+WALL_GLYPHS[WALL_N | WALL_S | WALL_W] = "┤"
+WALL_GLYPHS[WALL_N | WALL_E | WALL_W] = "┴"
+WALL_GLYPHS[WALL_S | WALL_E | WALL_W] = "┬"
+
+
+def floor_glyph(x: int, y: int, seed: int, unicode_ui: bool) -> str:
+    if not unicode_ui:
+        return "." if ((x * 5 + y * 3 + seed) % 9) else ","
+    if ((x * 7 + y * 11 + seed) % 31) == 0:
+        return "✧"
+    if ((x * 3 + y * 5 + seed) % 17) == 0:
+        return "⋅"
+    return "·"
+
+
+class GlyphAtlas:
+    # Per-map glyph and attribute rows, built once per grid version and copied straight into
+    # the frame buffer each frame.
+    __slots__ = ("version", "chars", "attrs")
+
+    def __init__(self, version: int, chars: list[str], attrs: list[list[int]]) -> None:
+        self.version = version
+        self.chars = chars
+        self.attrs = attrs
+
+
+def build_atlas(
+    grid: DungeonGrid,
+    seed: int,
+    unicode_ui: bool,
+    floor_attr: int,
+    wall_attr: int,
+    door_attr: int,
+) -> GlyphAtlas:
+    width = grid.width
+    height = grid.height
+    # Walls padded by one cell on every side, so edges read as walls like off-map cells do.
+    wall_table = bytes([0 if tile == TILE_FLOOR else 1 for tile in range(256)])
+    walls = grid.cells.translate(wall_table)
+    padded_w = width + 2
+    padded = bytearray(b"\x01") * (padded_w * (height + 2))
+    for y in range(height):
+        start = (y + 1) * padded_w + 1
+        padded[start : start + width] = walls[y * width : (y + 1) * width]
+
+    chars: list[str] = []
+    attrs: list[list[int]] = []
+    for y in range(height):
+        row_chars: list[str] = []
+        row_attrs: list[int] = []
+        above = y * padded_w + 1
+        here = above + padded_w
+        below = here + padded_w
+        for x in range(width):
+            tile = grid.cells[y * width + x]
+            if tile == TILE_DOOR:
+                row_chars.append("D")
+                row_attrs.append(door_attr)
+            elif tile == TILE_FLOOR:
+                row_chars.append(floor_glyph(x, y, seed, unicode_ui))
+                row_attrs.append(floor_attr)
+            else:
+                if unicode_ui:
+                    mask = (
+                        padded[above + x] * WALL_N
+                        | padded[below + x] * WALL_S
+                        | padded[here + x + 1] * WALL_E
+                        | padded[here + x - 1] * WALL_W
+                    )
+                    row_chars.append(WALL_GLYPHS[mask])
+                else:
+                    row_chars.append("#")
+                row_attrs.append(wall_attr)
+        chars.append("".join(row_chars))
+        attrs.append(row_attrs)
+    return GlyphAtlas(grid.version, chars, attrs)
@@ -0,0 +1,143 @@
+import curses
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .frame_buffer import FrameBuffer
+
+DEFAULT_TRACE_FILE = "term-realms-trace.json"
+# Roughly an hour of play at 60 FPS with a dozen spans per frame; later spans are counted, not kept.
+MAX_EVENTS = 2_000_000
+# Weight of the newest sample in the overlay's moving averages.
+_SMOOTHING = 0.1
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    # Opt-in frame profiler (TERM_REALMS_PROFILE). When disabled, span() hands back one shared
+    # no-op context manager and every other method returns straight away. Spans may be recorded
+    # from worker threads (the dungeon prefetcher), so the shared tables are read under a lock.
+    def __init__(self, enabled: bool = False, trace_path: Path | None = None) -> None:
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.frames = 0
+        self.fps = 0.0
+        self.span_ms: dict[str, float] = {}
+        self.dropped_events = 0
+        self._origin = time.perf_counter_ns()
+        self._last_frame = 0
+        self._open: dict[str, int] = {}
+        self._events: list[tuple[str, int, int, int]] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str) -> _Span | _NullSpan:
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def begin(self, name: str) -> None:
+        # For spans that start and end in different functions; end() closes the latest begin().
+        if self.enabled:
+            self._open[name] = time.perf_counter_ns()
+
+    def end(self, name: str) -> None:
+        if self.enabled:
+            start = self._open.pop(name, None)
+            if start is not None:
+                self.record(name, start, time.perf_counter_ns())
+
+    def record(self, name: str, start: int, end: int) -> None:
+        ms = (end - start) / 1e6
+        with self._lock:
+            average = self.span_ms.get(name)
+            self.span_ms[name] = ms if average is None else average + (ms - average) * _SMOOTHING
+            if len(self._events) < MAX_EVENTS:
+                self._events.append((name, start, end - start, threading.get_ident()))
+            else:
+                self.dropped_events += 1
+
+    def frame(self) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self._last_frame:
+            fps = 1e9 / max(1, now - self._last_frame)
+            self.fps = fps if self.frames == 1 else self.fps + (fps - self.fps) * _SMOOTHING
+        self._last_frame = now
+        self.frames += 1
+
+    def overlay_text(self) -> str:
+        with self._lock:
+            span_ms = list(self.span_ms.items())
+        spans = " ".join(f"{name} {ms:.2f}" for name, ms in span_ms)
+        return f" FPS {self.fps:5.1f} | {spans} ms "
+
+    def draw_overlay(self, frame: FrameBuffer) -> None:
+        # Top-right corner of the frame, clipped to the window width; the left edge wins if it overflows.
+        if not self.enabled or frame.width <= 0:
+            return
+        text = self.overlay_text()[: frame.width]
+        frame.put(0, frame.width - len(text), text, curses.A_REVERSE)
+
+    def write_trace(self) -> None:
+        # Chrome trace-event format: open in chrome://tracing or https://ui.perfetto.dev.
+        if not self.enabled or self.trace_path is None:
+            return
+        pid = os.getpid()
+        with self._lock:
+            recorded = list(self._events)
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000.0,
+                "dur": duration / 1000.0,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration, tid in recorded
+        ]
+        trace = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"frames": self.frames, "dropped_events": self.dropped_events},
+        }
+        try:
+            self.trace_path.write_text(json.dumps(trace), encoding="utf-8")
+        except OSError:
+            pass
+
+
+def profiler_from_env() -> Profiler:
+    raw = os.environ.get("TERM_REALMS_PROFILE", "").strip()
+    if not raw or raw == "0":
+        return Profiler()
+    return Profiler(True, Path(DEFAULT_TRACE_FILE if raw == "1" else raw))
@@ -0,0 +1,35 @@
+import hashlib
+import os
+import random
+
+
+class RngContext:
+    # Each named stream is seeded from a hash of (session seed, name), so draws in one
+    # subsystem never shift the sequence seen by another.
+    def __init__(self, seed: int | None = None) -> None:
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(1 << 63)
+        self._streams: dict[str, random.Random] = {}
+
+    def derive_seed(self, name: str) -> int:
+        digest = hashlib.blake2b(f"{self.seed}/{name}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def stream(self, name: str) -> random.Random:
+        rng = self._streams.get(name)
+        if rng is None:
+            rng = random.Random(self.derive_seed(name))
+            self._streams[name] = rng
+        return rng
+
+    def fork(self, name: str) -> "RngContext":
+        return RngContext(self.derive_seed(name))
+
+
+def seed_from_env() -> int | None:
+    raw = os.environ.get("TERM_REALMS_SEED", "").strip()
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return int.from_bytes(hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest(), "big")
@@ -1,5 +1,6 @@
 from .archer_training import start_archer_training
 from .combat import battle
+from .combat_sim import FightReport, simulate_fights
 from .dungeon import explore_dungeon
 from .meditation_training import start_meditation_training
 from .store import open_store
@@ -7,9 +8,11 @@ from .training import train
 from .warrior_training import start_warrior_training
 
 __all__ = [
+    "FightReport",
     "battle",
     "explore_dungeon",
     "open_store",
+    "simulate_fights",
     "start_archer_training",
     "start_meditation_training",
     "start_warrior_training",
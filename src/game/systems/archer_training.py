@@ -1,13 +1,16 @@
 import curses
 import os
 import random
-import time
 from dataclasses import dataclass
 
+from ..frame_buffer import FrameBuffer, FrameLayer
 from ..models import Player
+from ..profiler import Profiler
+from .entity_pool import EntityPool
+from .game_loop import FixedStepLoop, LoopStats
 
 
-@dataclass
+@dataclass(slots=True)
 class ArrowShot:
     x: float
     y: float
@@ -16,7 +19,7 @@ class ArrowShot:
     charged: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class MovingTarget:
     x: float
     y: float
@@ -51,11 +54,22 @@ class ArcherTrainer:
     _DURATION = 48.0
     _FOCUS_START = 20
     _INPUT_RELEASE_WINDOW = 0.11
-
-    def __init__(self, stdscr: curses.window, player: Player) -> None:
+    _SPATIAL_HASH_MIN_PAIRS = 64
+
+    def __init__(
+        self,
+        stdscr: curses.window,
+        player: Player,
+        rng: random.Random | None = None,
+        frame: FrameBuffer | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
         self.stdscr = stdscr
         self.player = player
-        self.rng = random.Random()
+        self.rng = rng or random.Random()
+        self.frame = frame or FrameBuffer()
+        self.profiler = profiler or Profiler()
+        self._chrome: FrameLayer | None = None
         self._unicode_ui = os.environ.get("TERM_REALMS_ASCII", "0") != "1"
 
         max_y, max_x = self.stdscr.getmaxyx()
@@ -96,38 +110,42 @@ class ArcherTrainer:
 
         self.arrows: list[ArrowShot] = []
         self.targets: list[MovingTarget] = []
+        self.arrow_pool: EntityPool[ArrowShot] = EntityPool(ArrowShot)
+        self.target_pool: EntityPool[MovingTarget] = EntityPool(MovingTarget)
+        self.pools = (self.arrow_pool, self.target_pool)
+        # Per-frame scratch for collisions and cleanup, cleared rather than rebuilt each frame.
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        self._candidates: list[int] = []
+        self._arrow_used: list[int] = []
+        self._target_used: list[int] = []
+        self.loop_stats = LoopStats()
 
     def run(self) -> ArcherTrainingResult:
         self.stdscr.nodelay(True)
         self.stdscr.keypad(True)
-        last = time.monotonic()
-        ended_by = "time_up"
         try:
-            while True:
-                now = time.monotonic()
-                dt = min(0.05, now - last)
-                last = now
+            self.loop_stats = FixedStepLoop(self._FRAME_DT, profiler=self.profiler).run(
+                self.handle_input,
+                self.update,
+                self.render,
+                self.finished,
+            )
+        finally:
+            self.stdscr.nodelay(False)
+        return self.result()
 
-                self.handle_input(now)
-                self.update(dt, now)
-                self.render(now)
+    def result(self) -> ArcherTrainingResult:
+        return self._build_result(self.ended_by())
 
-                if self.quit_requested:
-                    ended_by = "quit"
-                    break
-                if self.focus <= 0:
-                    ended_by = "focus_zero"
-                    break
-                if self.elapsed >= self._DURATION:
-                    ended_by = "time_up"
-                    break
+    def finished(self) -> bool:
+        return self.quit_requested or self.focus <= 0 or self.elapsed >= self._DURATION
 
-                spent = time.monotonic() - now
-                if spent < self._FRAME_DT:
-                    time.sleep(self._FRAME_DT - spent)
-        finally:
-            self.stdscr.nodelay(False)
-        return self._build_result(ended_by)
+    def ended_by(self) -> str:
+        if self.quit_requested:
+            return "quit"
+        if self.focus <= 0:
+            return "focus_zero"
+        return "time_up"
 
     def handle_input(self, now: float) -> None:
         while True:
@@ -165,11 +183,20 @@ class ArcherTrainer:
         self._clean_lists()
 
     def render(self, now: float) -> None:
-        self.stdscr.erase()
-        self._draw_frame()
-        self._draw_arena(now)
-        self._draw_hud(now)
-        self.stdscr.refresh()
+        with self.profiler.span("draw"):
+            # Frame and arena borders never change, so they are drawn once and restored each frame.
+            if self._chrome is None or not self.frame.restore(self._chrome):
+                self.frame.begin(self.stdscr)
+                self._draw_frame()
+                self._draw_arena_borders()
+                self._chrome = self.frame.snapshot()
+            self._draw_arena(now)
+            self._draw_hud(now)
+        with self.profiler.span("refresh"):
+            self.profiler.draw_overlay(self.frame)
+            self.frame.present(self.stdscr)
+            self._flush()
+        self.profiler.frame()
 
     def _update_charge(self, dt: float, now: float) -> None:
         if not self.charging:
@@ -206,7 +233,7 @@ class ArcherTrainer:
         fake = self.elapsed > 20 and self.rng.random() < min(0.22, 0.05 + self.elapsed * 0.003)
         small = self.elapsed > 26 and self.rng.random() < 0.25
         self.targets.append(
-            MovingTarget(
+            self.target_pool.acquire(
                 x=float(self.arena_w - 2),
                 y=y,
                 vx=-speed,
@@ -237,50 +264,93 @@ class ArcherTrainer:
             a.y += a.vy * dt
 
     def _resolve_collisions(self, now: float) -> None:
-        target_used: set[int] = set()
-        arrow_used: set[int] = set()
-        for ai, arrow in enumerate(self.arrows):
+        if not self.arrows or not self.targets:
+            return
+        # With many arrow/target pairs, targets are bucketed by rounded arena cell. Hit windows
+        # are under one cell wide, so an arrow only needs the 3x3 buckets around its own cell.
+        # Buckets are kept between frames (one per arena cell at most) and emptied here.
+        bucketed = len(self.arrows) * len(self.targets) >= self._SPATIAL_HASH_MIN_PAIRS
+        buckets = self._buckets
+        if bucketed:
+            for bucket in buckets.values():
+                bucket.clear()
             for ti, target in enumerate(self.targets):
+                key = (int(round(target.x)), int(round(target.y)))
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = []
+                bucket.append(ti)
+
+        # Few hits land per frame, so a list is as quick as a set for the membership test.
+        target_used = self._target_used
+        arrow_used = self._arrow_used
+        target_used.clear()
+        arrow_used.clear()
+        candidates = self._candidates
+        for ai, arrow in enumerate(self.arrows):
+            candidates.clear()
+            if not bucketed:
+                candidates.extend(range(len(self.targets)))
+            else:
+                cx = int(round(arrow.x))
+                cy = int(round(arrow.y))
+                for bx in (cx - 1, cx, cx + 1):
+                    for by in (cy - 1, cy, cy + 1):
+                        bucket = buckets.get((bx, by))
+                        if bucket:
+                            candidates.extend(bucket)
+                # Sorted so the lowest-index target wins, as in a front-to-back scan.
+                candidates.sort()
+            hit = -1
+            for ti in candidates:
                 if ti in target_used:
                     continue
+                target = self.targets[ti]
                 hit_radius = 0.40 if target.small else 0.70
                 if abs(arrow.x - target.x) <= hit_radius and abs(arrow.y - target.y) <= 0.65:
-                    arrow_used.add(ai)
-                    target_used.add(ti)
-                    if target.fake:
-                        self.focus -= 2
-                        self.combo = 0
-                        self.misses += 1
-                        self.flash_miss_until = now + 0.12
-                    else:
-                        self.hits += 1
-                        self.combo += 1
-                        self.best_combo = max(self.best_combo, self.combo)
-                        points = 10 + (4 if arrow.charged else 0) + min(20, self.combo * 2)
-                        if target.small:
-                            points += 6
-                        self.score += points
-                        self.flash_hit_until = now + 0.10
-                        if self.combo >= 5:
-                            self.eagle_eye_until = max(self.eagle_eye_until, now + 2.5)
+                    hit = ti
                     break
-
-        if target_used:
-            self.targets = [t for i, t in enumerate(self.targets) if i not in target_used]
-        if arrow_used:
-            self.arrows = [a for i, a in enumerate(self.arrows) if i not in arrow_used]
+            if hit == -1:
+                continue
+            target = self.targets[hit]
+            arrow_used.append(ai)
+            target_used.append(hit)
+            if target.fake:
+                self.focus -= 2
+                self.combo = 0
+                self.misses += 1
+                self.flash_miss_until = now + 0.12
+            else:
+                self.hits += 1
+                self.combo += 1
+                self.best_combo = max(self.best_combo, self.combo)
+                points = 10 + (4 if arrow.charged else 0) + min(20, self.combo * 2)
+                if target.small:
+                    points += 6
+                self.score += points
+                self.flash_hit_until = now + 0.10
+                if self.combo >= 5:
+                    self.eagle_eye_until = max(self.eagle_eye_until, now + 2.5)
+
+        self.target_pool.swap_remove(self.targets, target_used)
+        self.arrow_pool.swap_remove(self.arrows, arrow_used)
 
     def _clean_lists(self) -> None:
-        kept_arrows: list[ArrowShot] = []
-        for a in self.arrows:
+        gone = self._arrow_used
+        gone.clear()
+        for i, a in enumerate(self.arrows):
             if a.x > self.arena_w - 1 or a.y < 0 or a.y > self.arena_h - 1:
                 self.misses += 1
                 self.focus -= 1
                 self.combo = 0
-                continue
-            kept_arrows.append(a)
-        self.arrows = kept_arrows
-        self.targets = [t for t in self.targets if t.x >= 1]
+                gone.append(i)
+        self.arrow_pool.swap_remove(self.arrows, gone)
+        gone = self._target_used
+        gone.clear()
+        for i, t in enumerate(self.targets):
+            if t.x < 1:
+                gone.append(i)
+        self.target_pool.swap_remove(self.targets, gone)
 
     def _fire_arrow(self) -> None:
         if self.shot_cooldown > 0:
@@ -289,7 +359,7 @@ class ArcherTrainer:
         speed = 16.0 + self.charge_power * 10.0
         vy = self.wind * (0.55 if charged else 1.0)
         self.arrows.append(
-            ArrowShot(
+            self.arrow_pool.acquire(
                 x=float(self.archer_x + 1),
                 y=float(self.archer_y),
                 vx=speed,
@@ -325,7 +395,7 @@ class ArcherTrainer:
             self._c(3) | curses.A_BOLD,
         )
 
-    def _draw_arena(self, now: float) -> None:
+    def _draw_arena_borders(self) -> None:
         h = "─" if self._unicode_ok() else "-"
         v = "│" if self._unicode_ok() else "|"
         for x in range(self.arena_x, self.arena_x + self.arena_w):
@@ -335,6 +405,7 @@ class ArcherTrainer:
             self._safe_addstr(y, self.arena_x, v, self._c(1))
             self._safe_addstr(y, self.arena_x + self.arena_w - 1, v, self._c(1))
 
+    def _draw_arena(self, now: float) -> None:
         for i in range(20):
             nx = self.arena_x + 1 + ((self.phase + i * 9) % max(1, self.arena_w - 2))
             ny = self.arena_y + 1 + ((self.phase // 3 + i * 5) % max(1, self.arena_h - 2))
@@ -440,30 +511,33 @@ class ArcherTrainer:
         )
 
     def _safe_addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
-        max_y, max_x = self.stdscr.getmaxyx()
-        if y < 0 or y >= max_y or x >= max_x:
-            return
-        if x < 0:
-            text = text[-x:]
-            x = 0
-        if not text:
-            return
-        clipped = text[: max_x - x]
-        if not clipped:
-            return
-        try:
-            self.stdscr.addstr(y, x, clipped, attr)
-        except curses.error:
-            pass
+        self.frame.put(y, x, text, attr)
 
     def _c(self, pair_id: int) -> int:
-        if not curses.has_colors():
+        # curses.error here means no initscr(), i.e. a headless run (see trainer_sim).
+        try:
+            if not curses.has_colors():
+                return 0
+            return curses.color_pair(pair_id)
+        except curses.error:
             return 0
-        return curses.color_pair(pair_id)
+
+    def _flush(self) -> None:
+        self.stdscr.noutrefresh()
+        try:
+            curses.doupdate()
+        except curses.error:
+            pass
 
     def _unicode_ok(self) -> bool:
         return self._unicode_ui
 
 
-def start_archer_training(stdscr: curses.window, player: Player) -> ArcherTrainingResult:
-    return ArcherTrainer(stdscr, player).run()
+def start_archer_training(
+    stdscr: curses.window,
+    player: Player,
+    rng: random.Random | None = None,
+    frame: FrameBuffer | None = None,
+    profiler: Profiler | None = None,
+) -> ArcherTrainingResult:
+    return ArcherTrainer(stdscr, player, rng, frame, profiler).run()
@@ -0,0 +1,213 @@
+import argparse
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..data_loader import content_store, load_monsters, load_skills
+from ..rng import RngContext
+from .combat import scale_encounter
+from .combat_sim import attack_policy, cautious_policy, simulate_fights, skill_policy
+from .stats import CLASS_TEMPLATES, player_at_level
+
+POLICIES = {
+    "attack": attack_policy,
+    "skill": skill_policy,
+    "cautious": cautious_policy,
+}
+
+SWEEP_COLUMNS = [
+    "archetype",
+    "level",
+    "tier",
+    "monster",
+    "policy",
+    "seed",
+    "fights",
+    "wins",
+    "losses",
+    "escapes",
+    "win_rate",
+    "mean_turns",
+    "turns_p50",
+    "turns_p90",
+    "mean_hp_remaining",
+    "hp_p10",
+]
+
+
+@dataclass(frozen=True)
+class SweepCell:
+    archetype: str
+    level: int
+    tier: int
+    monster: str
+
+    @property
+    def key(self) -> tuple[str, int, int, str]:
+        return self.archetype, self.level, self.tier, self.monster
+
+
+def build_grid(
+    archetypes: list[str],
+    levels: list[int],
+    tiers: list[int],
+    monsters: list[str],
+) -> list[SweepCell]:
+    return [SweepCell(*combo) for combo in itertools.product(archetypes, levels, tiers, monsters)]
+
+
+def cell_seed(base_seed: int, cell: SweepCell, policy: str) -> int:
+    # Seeds depend only on the cell, so results do not change with worker count or chunking.
+    return RngContext(base_seed).derive_seed(f"sweep/{policy}/{cell.key}")
+
+
+def run_cells(cells: list[SweepCell], policy: str, fights: int, base_seed: int) -> list[dict]:
+    templates = content_store().monsters_by_name
+    skills = load_skills()
+    rows: list[dict] = []
+    for cell in cells:
+        seed = cell_seed(base_seed, cell, policy)
+        player = player_at_level(cell.archetype, cell.level)
+        monster = scale_encounter(templates[cell.monster], cell.tier)
+        report = simulate_fights(
+            player,
+            monster,
+            skills.get(cell.archetype, []),
+            POLICIES[policy],
+            fights,
+            random.Random(seed),
+        )
+        rows.append(
+            {
+                "archetype": cell.archetype,
+                "level": cell.level,
+                "tier": cell.tier,
+                "monster": cell.monster,
+                "policy": policy,
+                "seed": seed,
+                "fights": report.fights,
+                "wins": report.wins,
+                "losses": report.losses,
+                "escapes": report.escapes,
+                "win_rate": f"{report.win_rate:.6f}",
+                "mean_turns": f"{report.mean_turns():.4f}",
+                "turns_p50": report.turns_percentile(0.5),
+                "turns_p90": report.turns_percentile(0.9),
+                "mean_hp_remaining": f"{report.mean_hp_remaining():.4f}",
+                "hp_p10": report.hp_percentile(0.1),
+            }
+        )
+    return rows
+
+
+def completed_cells(out_path: Path, policy: str) -> set[tuple[str, int, int, str, int, int]]:
+    # (archetype, level, tier, monster, seed, fights) of every row written for `policy`. The seed
+    # and fight count are part of the key, so a rerun with other --seed or --fights adds rows
+    # instead of taking the old results as done.
+    if not out_path.exists():
+        return set()
+    done: set[tuple[str, int, int, str, int, int]] = set()
+    with out_path.open("r", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            try:
+                if row["policy"] == policy:
+                    done.add(
+                        (
+                            row["archetype"],
+                            int(row["level"]),
+                            int(row["tier"]),
+                            row["monster"],
+                            int(row["seed"]),
+                            int(row["fights"]),
+                        )
+                    )
+            except (KeyError, TypeError, ValueError):
+                continue
+    return done
+
+
+def run_sweep(
+    out_path: Path,
+    cells: list[SweepCell],
+    policy: str = "attack",
+    fights: int = 20_000,
+    seed: int = 0,
+    workers: int | None = None,
+    chunk_size: int = 4,
+) -> int:
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'. Choose from: {', '.join(sorted(POLICIES))}.")
+    _repair_partial_line(out_path)
+    done = completed_cells(out_path, policy)
+    pending = [cell for cell in cells if (*cell.key, cell_seed(seed, cell, policy), fights) not in done]
+    if not pending:
+        return 0
+
+    write_header = not out_path.exists() or out_path.stat().st_size == 0
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    written = 0
+    with out_path.open("a", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=SWEEP_COLUMNS)
+        if write_header:
+            writer.writeheader()
+            file.flush()
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(run_cells, chunk, policy, fights, seed) for chunk in chunks]
+            for future in as_completed(futures):
+                rows = future.result()
+                writer.writerows(rows)
+                file.flush()
+                written += len(rows)
+    return written
+
+
+def _repair_partial_line(out_path: Path) -> None:
+    # A row cut off by an interrupted run is dropped here and recomputed.
+    if not out_path.exists():
+        return
+    data = out_path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        out_path.write_bytes(data[: data.rfind(b"\n") + 1])
+
+
+def _int_range(text: str) -> list[int]:
+    values: list[int] = []
+    for part in text.split(","):
+        if "-" in part:
+            start, end = part.split("-", 1)
+            values.extend(range(int(start), int(end) + 1))
+        elif part:
+            values.append(int(part))
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep simulated combat outcomes for balance tuning.")
+    parser.add_argument("out", type=Path, help="CSV file to append results to (resumed if present)")
+    parser.add_argument("--classes", default=",".join(CLASS_TEMPLATES))
+    parser.add_argument("--levels", default="1-10")
+    parser.add_argument("--tiers", default="0-4")
+    parser.add_argument("--monsters", default="", help="comma separated names, default all")
+    parser.add_argument("--policy", default="attack", choices=sorted(POLICIES))
+    parser.add_argument("--fights", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    monsters = [name for name in args.monsters.split(",") if name] or [m["name"] for m in load_monsters()]
+    cells = build_grid(
+        [name for name in args.classes.split(",") if name],
+        _int_range(args.levels),
+        _int_range(args.tiers),
+        monsters,
+    )
+    written = run_sweep(args.out, cells, args.policy, args.fights, args.seed, args.workers)
+    print(f"{written} new rows written to {args.out} ({len(cells)} cells in grid).")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,89 @@ import random
 
 from ..models import Monster, Player
 
+PLAYER_CRIT_CHANCE = 0.15
+PLAYER_CRIT_BONUS = 4
+PLAYER_VARIANCE = (-1, 4)
+ENEMY_VARIANCE = (-4, 6)
+POTION_HEAL = 25
+ESCAPE_CHANCE = 0.35
 
-def _roll_damage(attacker_strength: int, defender_defense: int, bonus: int = 0) -> int:
-    variance = random.randint(-2, 3)
+
+def scale_encounter(template: dict, tier: int) -> Monster:
+    scaled_hp = max(1, int(round(template["hp"] * 0.75 * (1 + 0.15 * tier))))
+    scaled_strength = max(1, int(round(template["strength"] * (1 + 0.10 * tier))))
+    return Monster(
+        name=template["name"],
+        hp=scaled_hp,
+        strength=scaled_strength,
+        defense=template["defense"],
+        speed=template["speed"],
+        xp_reward=template["xp_reward"],
+        gold_reward=template["gold_reward"],
+    )
+
+
+def scale_boss(template: dict, tier: int) -> Monster:
+    return Monster(
+        name=f"Boss {template['name']}",
+        hp=max(1, int(round(template["hp"] * 1.8 * (1 + 0.18 * tier)))),
+        strength=max(1, int(round(template["strength"] * (1 + 0.20 * tier)))),
+        defense=max(1, int(round(template["defense"] * (1 + 0.15 * tier)))),
+        speed=max(1, int(round(template["speed"] * (1 + 0.08 * tier)))),
+        xp_reward=max(1, int(round(template["xp_reward"] * 2.0))),
+        gold_reward=max(1, int(round(template["gold_reward"] * 2.0))),
+    )
+
+
+def _roll_damage(
+    attacker_strength: int,
+    defender_defense: int,
+    bonus: int = 0,
+    rng: random.Random | None = None,
+) -> int:
+    variance = (rng or random).randint(-2, 3)
     raw_damage = attacker_strength + bonus + variance
     mitigation = defender_defense // 2
     return max(1, raw_damage - mitigation)
 
 
-def battle(player: Player, monster: Monster, class_skills: list[dict[str, float]]) -> bool:
+def roll_player_damage(
+    attacker_strength: int,
+    defender_defense: int,
+    bonus: int = 0,
+    rng: random.Random | None = None,
+) -> tuple[int, str]:
+    rng = rng or random
+    crit = rng.random() < PLAYER_CRIT_CHANCE
+    variance = rng.randint(*PLAYER_VARIANCE)
+    raw = attacker_strength + bonus + variance + (PLAYER_CRIT_BONUS if crit else 0)
+    mitigation = defender_defense // 2
+    damage = max(1, raw - mitigation)
+    return damage, ("Critical strike!" if crit else "")
+
+
+def roll_enemy_damage(
+    attacker_strength: int,
+    defender_defense: int,
+    rng: random.Random | None = None,
+) -> tuple[int, str]:
+    wild = (rng or random).randint(*ENEMY_VARIANCE)
+    raw = attacker_strength + wild
+    mitigation = defender_defense // 3
+    damage = max(1, raw - mitigation)
+    if wild >= 5:
+        return damage, "Heavy blow!"
+    if wild <= -3:
+        return damage, "Glancing hit."
+    return damage, ""
+
+
+def battle(
+    player: Player,
+    monster: Monster,
+    class_skills: list[dict[str, float]],
+    rng: random.Random | None = None,
+) -> bool:
     print(f"\nA wild {monster.name} appears!")
 
     while player.is_alive() and monster.is_alive():
@@ -18,13 +92,13 @@ def battle(player: Player, monster: Monster, class_skills: list[dict[str, float]
 
         player_turn_first = player.speed >= monster.speed
         if player_turn_first:
-            _player_turn(player, monster, class_skills)
+            _player_turn(player, monster, class_skills, rng)
             if monster.is_alive():
-                _monster_turn(player, monster)
+                _monster_turn(player, monster, rng)
         else:
-            _monster_turn(player, monster)
+            _monster_turn(player, monster, rng)
             if player.is_alive():
-                _player_turn(player, monster, class_skills)
+                _player_turn(player, monster, class_skills, rng)
 
     if player.is_alive():
         player.gain_xp(monster.xp_reward)
@@ -38,7 +112,13 @@ def battle(player: Player, monster: Monster, class_skills: list[dict[str, float]
     return False
 
 
-def _player_turn(player: Player, monster: Monster, class_skills: list[dict[str, float]]) -> None:
+def _player_turn(
+    player: Player,
+    monster: Monster,
+    class_skills: list[dict[str, float]],
+    rng: random.Random | None = None,
+) -> None:
+    rng = rng or random
     print("Your action:")
     print("1. Basic Attack")
     print("2. Skill Attack")
@@ -46,10 +126,10 @@ def _player_turn(player: Player, monster: Monster, class_skills: list[dict[str,
 
     choice = input("> ").strip()
     if choice == "2" and class_skills:
-        skill = random.choice(class_skills)
-        hit_roll = random.random()
+        skill = rng.choice(class_skills)
+        hit_roll = rng.random()
         if hit_roll <= skill["accuracy"]:
-            damage = _roll_damage(player.strength, monster.defense, skill["bonus_damage"])
+            damage = _roll_damage(player.strength, monster.defense, skill["bonus_damage"], rng)
             monster.hp -= damage
             print(f"You used {skill['name']} and dealt {damage} damage.")
         else:
@@ -62,12 +142,12 @@ def _player_turn(player: Player, monster: Monster, class_skills: list[dict[str,
         healed = player.heal(25)
         print(f"You used a potion and restored {healed} HP.")
     else:
-        damage = _roll_damage(player.strength, monster.defense)
+        damage = _roll_damage(player.strength, monster.defense, rng=rng)
         monster.hp -= damage
         print(f"You dealt {damage} damage.")
 
 
-def _monster_turn(player: Player, monster: Monster) -> None:
-    damage = _roll_damage(monster.strength, player.defense)
+def _monster_turn(player: Player, monster: Monster, rng: random.Random | None = None) -> None:
+    damage = _roll_damage(monster.strength, player.defense, rng=rng)
     player.hp -= damage
     print(f"{monster.name} hits you for {damage} damage.")
@@ -0,0 +1,202 @@
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+from ..models import Monster, Player
+from .combat import (
+    ENEMY_VARIANCE,
+    ESCAPE_CHANCE,
+    PLAYER_CRIT_BONUS,
+    PLAYER_CRIT_CHANCE,
+    PLAYER_VARIANCE,
+    POTION_HEAL,
+)
+from .stats import histogram_mean, histogram_percentile
+
+ACTION_ATTACK = "Attack"
+ACTION_SKILL = "Skill"
+ACTION_ITEM = "Item"
+ACTION_RUN = "Run"
+
+# Policies see (player_hp, player_max_hp, player_mp, potions, monster_hp) and return an action.
+Policy = Callable[[int, int, int, int, int], str]
+
+
+def attack_policy(hp: int, max_hp: int, mp: int, potions: int, monster_hp: int) -> str:
+    return ACTION_ATTACK
+
+
+def skill_policy(hp: int, max_hp: int, mp: int, potions: int, monster_hp: int) -> str:
+    return ACTION_SKILL
+
+
+def cautious_policy(hp: int, max_hp: int, mp: int, potions: int, monster_hp: int) -> str:
+    if potions > 0 and hp * 3 <= max_hp:
+        return ACTION_ITEM
+    return ACTION_ATTACK
+
+
+@dataclass
+class FightReport:
+    fights: int = 0
+    wins: int = 0
+    losses: int = 0
+    escapes: int = 0
+    # Fights cut off by a turn limit (combat_vec's max_turns); the scalar simulator has none.
+    unresolved: int = 0
+    turns_to_kill: Counter[int] = field(default_factory=Counter)
+    hp_remaining: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+    def mean_turns(self) -> float:
+        return histogram_mean(self.turns_to_kill)
+
+    def mean_hp_remaining(self) -> float:
+        return histogram_mean(self.hp_remaining)
+
+    def turns_percentile(self, q: float) -> int:
+        return histogram_percentile(self.turns_to_kill, q)
+
+    def hp_percentile(self, q: float) -> int:
+        return histogram_percentile(self.hp_remaining, q)
+
+    def merge(self, other: "FightReport") -> None:
+        self.fights += other.fights
+        self.wins += other.wins
+        self.losses += other.losses
+        self.escapes += other.escapes
+        self.unresolved += other.unresolved
+        self.turns_to_kill.update(other.turns_to_kill)
+        self.hp_remaining.update(other.hp_remaining)
+
+    def summary(self) -> str:
+        text = (
+            f"{self.fights} fights | win {self.win_rate * 100:.1f}% | "
+            f"turns p50 {self.turns_percentile(0.5)} p90 {self.turns_percentile(0.9)} | "
+            f"HP left mean {self.mean_hp_remaining():.1f} p10 {self.hp_percentile(0.1)}"
+        )
+        if self.unresolved:
+            text += f" | {self.unresolved} unresolved"
+        return text
+
+
+def simulate_fights(
+    player: Player,
+    monster: Monster,
+    class_skills: list[dict] | None = None,
+    policy: Policy = attack_policy,
+    fights: int = 10_000,
+    rng: random.Random | None = None,
+) -> FightReport:
+    # Mirrors GameEngine._combat_mode: the player acts, then a surviving monster retaliates.
+    # Neither `player` nor `monster` is mutated; every fight starts from their current stats.
+    rng = rng or random.Random()
+    rnd = rng.random
+    report = FightReport()
+
+    attack_table = _player_damage_table(player.strength, monster.defense, 0)
+    enemy_table = _enemy_damage_table(monster.strength, player.defense)
+    enemy_span = len(enemy_table) - 1
+    skills = [
+        (
+            float(skill["accuracy"]),
+            int(skill.get("mp_cost", 0)),
+            _player_damage_table(player.strength, monster.defense, int(skill["bonus_damage"])),
+        )
+        for skill in (class_skills or [])
+    ]
+    skill_count = len(skills)
+    uses_mp = player.archetype == "Mage"
+
+    crit_chance = PLAYER_CRIT_CHANCE
+    variance_span = PLAYER_VARIANCE[1] - PLAYER_VARIANCE[0] + 1
+    crit_scale = variance_span / crit_chance
+    normal_scale = variance_span / (1.0 - crit_chance)
+
+    start_hp = player.hp
+    max_hp = player.max_hp
+    start_mp = player.mp
+    start_potions = player.potions
+    start_monster_hp = monster.hp
+
+    wins = losses = escapes = 0
+    turns_to_kill = report.turns_to_kill
+    hp_remaining = report.hp_remaining
+
+    for _ in range(fights):
+        hp = start_hp
+        mp = start_mp
+        potions = start_potions
+        monster_hp = start_monster_hp
+        turns = 0
+        escaped = False
+
+        while hp > 0 and monster_hp > 0:
+            turns += 1
+            action = policy(hp, max_hp, mp, potions, monster_hp)
+            table = None
+            if action == ACTION_ATTACK:
+                table = attack_table
+            elif action == ACTION_SKILL:
+                if skill_count:
+                    accuracy, mp_cost, skill_table = skills[int(rnd() * skill_count)]
+                    if uses_mp and mp_cost > 0:
+                        if mp < mp_cost:
+                            skill_table = None
+                        else:
+                            mp -= mp_cost
+                    if skill_table is not None and rnd() <= accuracy:
+                        table = skill_table
+            elif action == ACTION_ITEM:
+                if potions > 0:
+                    potions -= 1
+                    hp = min(max_hp, hp + POTION_HEAL)
+            elif action == ACTION_RUN and rnd() < ESCAPE_CHANCE:
+                escaped = True
+                break
+
+            if table is not None:
+                roll = rnd()
+                if roll < crit_chance:
+                    monster_hp -= table[1][int(roll * crit_scale)]
+                else:
+                    monster_hp -= table[0][int((roll - crit_chance) * normal_scale)]
+
+            if monster_hp > 0:
+                hp -= enemy_table[int(rnd() * enemy_span)]
+
+        if escaped:
+            escapes += 1
+        elif hp > 0:
+            wins += 1
+            turns_to_kill[turns] += 1
+            hp_remaining[hp] += 1
+        else:
+            losses += 1
+
+    report.fights = fights
+    report.wins = wins
+    report.losses = losses
+    report.escapes = escapes
+    return report
+
+
+def _player_damage_table(strength: int, defense: int, bonus: int) -> tuple[list[int], list[int]]:
+    mitigation = defense // 2
+    low, high = PLAYER_VARIANCE
+    normal = [max(1, strength + bonus + v - mitigation) for v in range(low, high + 1)]
+    crit = [max(1, strength + bonus + v + PLAYER_CRIT_BONUS - mitigation) for v in range(low, high + 1)]
+    # Float rounding can land exactly on the upper edge; repeat the last entry to absorb it.
+    return normal + normal[-1:], crit + crit[-1:]
+
+
+def _enemy_damage_table(strength: int, defense: int) -> list[int]:
+    mitigation = defense // 3
+    low, high = ENEMY_VARIANCE
+    table = [max(1, strength + wild - mitigation) for wild in range(low, high + 1)]
+    return table + table[-1:]
+
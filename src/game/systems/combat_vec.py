@@ -0,0 +1,208 @@
+from collections import Counter
+from typing import Any, Callable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the scalar simulator in combat_sim covers plain installs.
+    np = None
+
+from .combat import (
+    ENEMY_VARIANCE,
+    ESCAPE_CHANCE,
+    PLAYER_CRIT_BONUS,
+    PLAYER_CRIT_CHANCE,
+    PLAYER_VARIANCE,
+    POTION_HEAL,
+)
+from .combat_sim import FightReport
+
+CODE_ATTACK = 0
+CODE_SKILL = 1
+CODE_ITEM = 2
+CODE_RUN = 3
+
+# Each lane draws one raw 64-bit word per turn, split into crit (32 bits, compared with a
+# threshold), player variance and enemy roll (16 bits each, scaled to their span). Turns where
+# some lane does not attack draw a second word: skill pick (16 bits), skill accuracy and escape
+# (24 bits each). Splitting bits is much cheaper than drawing one float per roll.
+_BITS_32 = (1 << 32) - 1
+_BITS_24 = (1 << 24) - 1
+_BITS_16 = (1 << 16) - 1
+
+# Vector policies see lane arrays (hp, max_hp, mp, potions, monster_hp) and return action codes.
+VectorPolicy = Callable[[Any, Any, Any, Any, Any], Any]
+
+
+def attack_policy_vec(hp: Any, max_hp: Any, mp: Any, potions: Any, monster_hp: Any) -> Any:
+    return np.full(hp.shape, CODE_ATTACK, dtype=np.int8)
+
+
+def skill_policy_vec(hp: Any, max_hp: Any, mp: Any, potions: Any, monster_hp: Any) -> Any:
+    return np.full(hp.shape, CODE_SKILL, dtype=np.int8)
+
+
+def cautious_policy_vec(hp: Any, max_hp: Any, mp: Any, potions: Any, monster_hp: Any) -> Any:
+    low = (potions > 0) & (hp * 3 <= max_hp)
+    return np.where(low, CODE_ITEM, CODE_ATTACK).astype(np.int8)
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def simulate_fights_vectorized(
+    fights: int,
+    player_hp: Any,
+    player_max_hp: Any,
+    player_strength: Any,
+    player_defense: Any,
+    monster_hp: Any,
+    monster_strength: Any,
+    monster_defense: Any,
+    player_mp: Any = 0,
+    potions: Any = 0,
+    class_skills: list[dict] | None = None,
+    uses_mp: bool = False,
+    policy: VectorPolicy | None = None,
+    rng: Any = None,
+    max_turns: int = 10_000,
+) -> FightReport:
+    # Every stat accepts a scalar or an array of length `fights`, so one call can cover a whole
+    # difficulty-tier grid. Each lane follows the same rules as combat_sim.simulate_fights.
+    if np is None:
+        raise RuntimeError("simulate_fights_vectorized requires NumPy; use combat_sim.simulate_fights instead.")
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    policy = policy or attack_policy_vec
+
+    def lanes(value: Any) -> Any:
+        return np.broadcast_to(np.asarray(value, dtype=np.int32), (fights,)).copy()
+
+    def fixed(value: Any) -> Any:
+        # Per-lane stats that never change stay scalars unless they differ between lanes.
+        value = np.asarray(value, dtype=np.int32)
+        return value if value.ndim == 0 else lanes(value)
+
+    # Working arrays start with every lane. A finished lane stays in them, masked out by `live`,
+    # until fewer than half are live; compacting then keeps the copying proportional to the
+    # lanes retired instead of paying for every array on every turn.
+    ids = np.arange(fights)
+    hp = lanes(player_hp)
+    max_hp = fixed(player_max_hp)
+    mp = lanes(player_mp)
+    stock = lanes(potions)
+    enemy_hp = lanes(monster_hp)
+    base_player = fixed(player_strength) - fixed(monster_defense) // 2
+    base_enemy = fixed(monster_strength) - fixed(player_defense) // 3
+
+    final_hp = hp.copy()
+    final_enemy = enemy_hp.copy()
+    final_turns = np.zeros(fights, dtype=np.int32)
+    escaped = np.zeros(fights, dtype=bool)
+    unresolved = np.zeros(fights, dtype=bool)
+
+    skills = class_skills or []
+    skill_bonus = np.array([int(s["bonus_damage"]) for s in skills] or [0], dtype=np.int32)
+    skill_accuracy = np.array([float(s["accuracy"]) for s in skills] or [0.0])
+    skill_cost = np.array([int(s.get("mp_cost", 0)) for s in skills] or [0], dtype=np.int32)
+    if not uses_mp:
+        skill_cost[:] = 0
+    skill_count = len(skills)
+
+    var_low, var_high = PLAYER_VARIANCE
+    var_span = var_high - var_low + 1
+    wild_low, wild_high = ENEMY_VARIANCE
+    wild_span = wild_high - wild_low + 1
+    raw = rng.bit_generator.random_raw
+    crit_below = np.uint64(round(PLAYER_CRIT_CHANCE * (1 << 32)))
+    escape_below = np.uint64(round(ESCAPE_CHANCE * (1 << 24)))
+    # rolls <= accuracy in the scalar rules; with 24-bit rolls that is roll < accuracy * 2**24 + 1.
+    hit_below = (np.floor(skill_accuracy * (1 << 24)) + 1).astype(np.uint64)
+
+    def compact(keep: Any) -> None:
+        nonlocal ids, hp, max_hp, mp, stock, enemy_hp, base_player, base_enemy
+        ids, hp, mp, stock, enemy_hp = (a[keep] for a in (ids, hp, mp, stock, enemy_hp))
+        max_hp, base_player, base_enemy = (a if a.ndim == 0 else a[keep] for a in (max_hp, base_player, base_enemy))
+
+    live = (hp > 0) & (enemy_hp > 0)
+    live_count = int(live.sum())
+    if live_count < fights:
+        compact(live)
+        live = live[live]
+
+    turn = 0
+    while live_count and turn < max_turns:
+        turn += 1
+        size = ids.size
+        action = np.asarray(policy(hp, max_hp, mp, stock, enemy_hp))
+        choosing = bool((action != CODE_ATTACK).any())
+        word = raw(size)
+
+        damage = base_player + (((word >> 32) & _BITS_16) * var_span >> 16).astype(np.int32)
+        damage += var_low + ((word & _BITS_32) < crit_below) * PLAYER_CRIT_BONUS
+        if choosing:
+            extra = raw(size)
+            strikes = action == CODE_ATTACK
+            if skill_count:
+                pick = ((extra & _BITS_16) * skill_count >> 16).astype(np.intp)
+                cost = skill_cost[pick]
+                paid = (action == CODE_SKILL) & (mp >= cost)
+                mp -= np.where(paid, cost, 0)
+                hits = paid & ((extra >> 16) & _BITS_24 < hit_below[pick])
+                damage += np.where(hits, skill_bonus[pick], 0)
+                strikes |= hits
+            # The floor of 1 applies after the skill bonus, as in roll_player_damage.
+            np.maximum(damage, 1, out=damage)
+            enemy_hp -= np.where(strikes, damage, 0)
+            drinking = (action == CODE_ITEM) & (stock > 0)
+            stock -= drinking
+            hp = np.where(drinking, np.minimum(max_hp, hp + POTION_HEAL), hp)
+            fled = (action == CODE_RUN) & (extra >> 40 < escape_below)
+            retaliates = (enemy_hp > 0) & ~fled
+        else:
+            np.maximum(damage, 1, out=damage)
+            enemy_hp -= damage
+            fled = None
+            retaliates = enemy_hp > 0
+        wild = (word >> 48) * wild_span >> 16
+        wild = wild.astype(np.int32) + wild_low
+        hp -= np.where(retaliates, np.maximum(1, base_enemy + wild), 0)
+
+        alive = live & (hp > 0) & retaliates
+        done = live & ~alive
+        if done.any():
+            finished = ids[done]
+            final_hp[finished] = hp[done]
+            final_enemy[finished] = enemy_hp[done]
+            final_turns[finished] = turn
+            if fled is not None:
+                escaped[finished] = fled[done]
+            live_count -= finished.size
+        live = alive
+        if live_count * 2 < size:
+            compact(live)
+            live = live[live]
+
+    if live_count:
+        # Still fighting after max_turns; their final_* values are the starting ones, so these
+        # lanes count as neither a win, a loss nor an escape.
+        unresolved[ids[live]] = True
+
+    won = (final_hp > 0) & (final_enemy <= 0) & ~escaped
+    report = FightReport(
+        fights=fights,
+        wins=int(won.sum()),
+        losses=int(((final_hp <= 0) & ~escaped).sum()),
+        escapes=int(escaped.sum()),
+        unresolved=int(unresolved.sum()),
+    )
+    report.turns_to_kill = _histogram(final_turns[won])
+    report.hp_remaining = _histogram(final_hp[won])
+    return report
+
+
+def _histogram(values: Any) -> Counter[int]:
+    if not values.size:
+        return Counter()
+    counts = np.bincount(values)
+    return Counter({int(v): int(counts[v]) for v in np.flatnonzero(counts)})
@@ -1,6 +1,5 @@
-import random
-
 from ..models import Monster, Player
+from ..rng import RngContext
 from .combat import battle
 from .map_generator import DungeonMap, TILE_FLOOR, render_map
 
@@ -9,8 +8,10 @@ def explore_dungeon(
     player: Player,
     monster_data: list[dict],
     skills_by_class: dict[str, list[dict[str, float]]],
+    rng: RngContext | None = None,
 ) -> bool:
-    dungeon = DungeonMap()
+    rng = rng or RngContext()
+    dungeon = DungeonMap(rng.stream("map"))
     grid = dungeon.generate()
     player_x, player_y = dungeon.random_floor_tile()
     exit_x, exit_y = dungeon.random_floor_tile()
@@ -39,21 +40,21 @@ def explore_dungeon(
         if (
             next_x < 0
             or next_y < 0
-            or next_y >= len(grid)
-            or next_x >= len(grid[0])
-            or grid[next_y][next_x] != TILE_FLOOR
+            or next_y >= grid.height
+            or next_x >= grid.width
+            or grid.get(next_x, next_y) != TILE_FLOOR
         ):
             print("A wall blocks your path.")
             continue
 
         player_x, player_y = next_x, next_y
         if (player_x, player_y) == (exit_x, exit_y):
-            bonus_gold = random.randint(10, 22)
+            bonus_gold = rng.stream("loot").randint(10, 22)
             player.gold += bonus_gold
             print(f"You found the dungeon exit and secured {bonus_gold} bonus gold.")
             return True
 
-        if not _movement_event(player, monster_data, skills_by_class):
+        if not _movement_event(player, monster_data, skills_by_class, rng):
             return False
 
     return False
@@ -75,10 +76,12 @@ def _movement_event(
     player: Player,
     monster_data: list[dict],
     skills_by_class: dict[str, list[dict[str, float]]],
+    rng: RngContext,
 ) -> bool:
-    roll = random.random()
+    loot = rng.stream("loot")
+    roll = rng.stream("encounter").random()
     if roll < 0.27:
-        template = random.choice(monster_data)
+        template = rng.stream("encounter").choice(monster_data)
         monster = Monster(
             name=template["name"],
             hp=template["hp"],
@@ -88,10 +91,10 @@ def _movement_event(
             xp_reward=template["xp_reward"],
             gold_reward=template["gold_reward"],
         )
-        return battle(player, monster, skills_by_class.get(player.archetype, []))
+        return battle(player, monster, skills_by_class.get(player.archetype, []), rng.stream("combat"))
 
     if roll < 0.38:
-        found_gold = random.randint(4, 14)
+        found_gold = loot.randint(4, 14)
         player.gold += found_gold
         print(f"You found {found_gold} gold on the dungeon floor.")
         return True
@@ -0,0 +1,150 @@
+import hashlib
+import mmap
+import os
+import random
+import struct
+import threading
+from pathlib import Path
+
+from .map_generator import DungeonGrid, DungeonMap
+
+# Bump whenever DungeonMap.generate changes its output for the same seed and parameters.
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Fixed 16-byte header (magic, version, width, height) followed by width * height tile bytes,
+# row-major, exactly as DungeonGrid.cells stores them.
+_MAGIC = b"TRDG"
+_HEADER = struct.Struct("<4sIII")
+_SUFFIX = ".grid"
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "term-realms" / "dungeons"
+
+
+class DungeonCache:
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        seed: int,
+        width: int,
+        height: int,
+        fail_limit: int,
+        corridor_percent: int,
+        max_rooms: int,
+    ) -> str:
+        text = f"{CACHE_VERSION}/{seed}/{width}/{height}/{fail_limit}/{corridor_percent}/{max_rooms}"
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}{_SUFFIX}"
+
+    def load(self, key: str) -> DungeonGrid | None:
+        path = self.path_for(key)
+        try:
+            with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                grid = _decode(data)
+        except (OSError, ValueError):
+            grid = None
+        if grid is None:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return grid
+
+    def store(self, key: str, grid: DungeonGrid) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        temp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp.write_bytes(_HEADER.pack(_MAGIC, CACHE_VERSION, grid.width, grid.height) + grid.cells)
+            os.replace(temp, path)
+        except OSError:
+            # A full disk must not leave partial temp files behind; eviction only counts entries.
+            temp.unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            total = 0
+            for path in self.root.glob(f"*{_SUFFIX}"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+
+    def get_or_generate(
+        self,
+        seed: int,
+        width: int = 46,
+        height: int = 22,
+        fail_limit: int = 110,
+        corridor_percent: int = 50,
+        max_rooms: int = 60,
+    ) -> DungeonGrid:
+        key = self.key(seed, width, height, fail_limit, corridor_percent, max_rooms)
+        grid = self.load(key)
+        if grid is not None:
+            self.hits += 1
+            return grid
+        self.misses += 1
+        grid = generate_grid(seed, width, height, fail_limit, corridor_percent, max_rooms)
+        try:
+            self.store(key, grid)
+        except OSError:
+            pass
+        return grid
+
+
+def generate_grid(
+    seed: int,
+    width: int = 46,
+    height: int = 22,
+    fail_limit: int = 110,
+    corridor_percent: int = 50,
+    max_rooms: int = 60,
+    cache: DungeonCache | None = None,
+) -> DungeonGrid:
+    # The grid depends only on these arguments, which is what makes it safe to cache.
+    if cache is not None:
+        return cache.get_or_generate(seed, width, height, fail_limit, corridor_percent, max_rooms)
+    return DungeonMap(random.Random(seed)).generate(width, height, fail_limit, corridor_percent, max_rooms)
+
+
+def cache_from_env() -> DungeonCache | None:
+    raw = os.environ.get("TERM_REALMS_MAP_CACHE", "").strip()
+    if not raw or raw == "0":
+        return None
+    return DungeonCache(None if raw == "1" else Path(raw))
+
+
+def _decode(data: mmap.mmap) -> DungeonGrid | None:
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, width, height = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != CACHE_VERSION or len(data) != _HEADER.size + width * height:
+        return None
+    return DungeonGrid.from_bytes(width, height, data[_HEADER.size :])
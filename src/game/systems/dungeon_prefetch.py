@@ -0,0 +1,44 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class DungeonPrefetcher(Generic[T]):
+    # Holds at most one build in flight. The build must be a pure function of its key, so a
+    # prefetched result is interchangeable with a synchronous one and a stale key can be dropped.
+    def __init__(self, build: Callable[[Hashable], T]) -> None:
+        self._build = build
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dungeon-prefetch")
+        self._key: Hashable | None = None
+        self._future: Future[T] | None = None
+
+    def prefetch(self, key: Hashable) -> None:
+        if self._future is not None and self._key == key:
+            return
+        self._discard()
+        self._key = key
+        self._future = self._executor.submit(self._build, key)
+
+    def ready(self, key: Hashable) -> bool:
+        return self._future is not None and self._key == key and self._future.done()
+
+    def take(self, key: Hashable) -> T:
+        future = self._future if self._key == key else None
+        self._discard()
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass
+        return self._build(key)
+
+    def shutdown(self) -> None:
+        self._discard()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _discard(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+        self._key = None
+        self._future = None
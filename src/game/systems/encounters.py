@@ -0,0 +1,70 @@
+import bisect
+import random
+from itertools import accumulate
+from typing import Any, Generic, Mapping, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class WeightedSampler(Generic[T]):
+    # Integer weights, built once. A draw is one randrange over the total plus a bisect on the
+    # running sums, with nothing allocated. randrange(total) consumes the RNG exactly like
+    # choice() on a list repeating each item `weight` times, so seeded runs pick the same items.
+    def __init__(self, items: Sequence[T], weights: Sequence[int]) -> None:
+        kept = [(item, weight) for item, weight in zip(items, weights) if weight > 0]
+        if not kept:
+            raise ValueError("WeightedSampler needs at least one positive weight")
+        self.items = [item for item, _ in kept]
+        self.cumulative = list(accumulate(weight for _, weight in kept))
+        self.total = self.cumulative[-1]
+
+    def draw(self, rng: random.Random) -> T:
+        return self.items[bisect.bisect_right(self.cumulative, rng.randrange(self.total))]
+
+
+class EncounterTable:
+    # Monster samplers for the weight tables in data/stores/encounters.json. A tier table applies
+    # from its tier upward and a biome table on top of it; each sampler is built on first use.
+    # Samplers hold record positions and weights only, so building one never reads a monster.
+    def __init__(
+        self,
+        monsters: Sequence[dict[str, Any]],
+        monster_index: Mapping[str, int],
+        encounters: dict[str, Any],
+    ) -> None:
+        self.monsters = monsters
+        self.monster_index = monster_index
+        self.encounters = encounters
+        self._tier_starts = sorted(encounters["tiers"])
+        self._samplers: dict[str | None, dict[int, WeightedSampler[int]]] = {
+            biome: {} for biome in (None, *encounters["biomes"])
+        }
+
+    def sampler(self, tier: int, biome: str | None = None) -> WeightedSampler[int]:
+        by_tier = self._samplers.get(biome)
+        if by_tier is None:
+            biome, by_tier = None, self._samplers[None]
+        index = bisect.bisect_right(self._tier_starts, tier)
+        start = self._tier_starts[index - 1] if index else -1
+        sampler = by_tier.get(start)
+        if sampler is None:
+            sampler = by_tier[start] = self._build(start, biome)
+        return sampler
+
+    def pick(self, rng: random.Random, tier: int, biome: str | None = None) -> dict[str, Any]:
+        return self.monsters[self.sampler(tier, biome).draw(rng)]
+
+    def _build(self, tier_start: int, biome: str | None) -> WeightedSampler[int]:
+        weights = dict(self.encounters["weights"])
+        if tier_start >= 0:
+            weights.update(self.encounters["tiers"][tier_start])
+        if biome is not None:
+            weights.update(self.encounters["biomes"][biome])
+        default = self.encounters["default_weight"]
+        column = [default] * len(self.monsters)
+        for name, weight in weights.items():
+            column[self.monster_index[name]] = weight
+        if not any(column):
+            # Every monster weighted out: fall back to an even pick rather than no encounter.
+            column = [1] * len(column)
+        return WeightedSampler(range(len(column)), column)
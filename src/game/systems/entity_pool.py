@@ -0,0 +1,41 @@
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class EntityPool(Generic[T]):
+    # Recycles short-lived trainer entities. A released instance is re-initialised in place by
+    # acquire(), so `created` only grows while the live count reaches a new peak; once a trainer
+    # is in steady state its frames create no new entity objects.
+    def __init__(self, factory: Callable[..., T]) -> None:
+        self._factory = factory
+        self._free: list[T] = []
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self, *args: Any, **kwargs: Any) -> T:
+        self.acquired += 1
+        if self._free:
+            item = self._free.pop()
+            item.__init__(*args, **kwargs)
+            return item
+        self.created += 1
+        return self._factory(*args, **kwargs)
+
+    def release(self, item: T) -> None:
+        self.released += 1
+        self._free.append(item)
+
+    def swap_remove(self, items: list[T], indices: list[int]) -> None:
+        # Releases items[i] for each index by moving the last item into its hole; order is not kept.
+        # Sorts `indices` in place, so callers can pass a reused scratch list.
+        indices.sort(reverse=True)
+        for index in indices:
+            self.release(items[index])
+            last = items.pop()
+            if index < len(items):
+                items[index] = last
+
+    def in_use(self) -> int:
+        return self.acquired - self.released
@@ -0,0 +1,119 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Collection
+
+from ..profiler import Profiler
+
+# Timing samples kept for the percentiles: the most recent ones, about a minute at 60 Hz.
+SAMPLE_LIMIT = 4096
+
+
+@dataclass
+class LoopStats:
+    updates: int = 0
+    frames: int = 0
+    dropped_frames: int = 0
+    lost_time: float = 0.0
+    update_times: deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_LIMIT))
+    render_times: deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_LIMIT))
+
+    def update_ms(self, q: float) -> float:
+        return _percentile(self.update_times, q) * 1000.0
+
+    def render_ms(self, q: float) -> float:
+        return _percentile(self.render_times, q) * 1000.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.updates} updates, {self.frames} frames, {self.dropped_frames} dropped | "
+            f"update p50 {self.update_ms(0.5):.2f} ms p99 {self.update_ms(0.99):.2f} ms | "
+            f"render p50 {self.render_ms(0.5):.2f} ms p99 {self.render_ms(0.99):.2f} ms"
+        )
+
+
+class FixedStepLoop:
+    # Simulation always advances in `step`-second updates on a simulated clock that starts at 0,
+    # so results do not depend on frame rate. Each pass runs at most one update; while more
+    # updates are due the render is skipped to catch up (at most `max_catch_up` in a row), and
+    # backlog beyond that many steps is dropped.
+    def __init__(
+        self,
+        step: float,
+        max_catch_up: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        profiler: Profiler | None = None,
+    ) -> None:
+        self.step = step
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+        self.profiler = profiler or Profiler()
+
+    def run(
+        self,
+        handle_input: Callable[[float], None],
+        update: Callable[[float, float], None],
+        render: Callable[[float], None],
+        finished: Callable[[], bool],
+    ) -> LoopStats:
+        stats = LoopStats()
+        clock = self.clock
+        span = self.profiler.span
+        step = self.step
+        max_backlog = step * self.max_catch_up
+        # Tolerance for clock and float rounding, so a frame that slept exactly one step runs it.
+        due = step - 1e-9
+        now = 0.0
+        backlog = 0.0
+        skipped = 0
+        last = clock()
+        while True:
+            frame_start = clock()
+            backlog += frame_start - last
+            last = frame_start
+            if backlog > max_backlog:
+                stats.lost_time += backlog - max_backlog
+                backlog = max_backlog
+
+            with span("input"):
+                handle_input(now)
+            done = finished()
+            ran = False
+            if not done and backlog >= due:
+                started = clock()
+                with span("update"):
+                    update(step, now)
+                stats.update_times.append(clock() - started)
+                stats.updates += 1
+                now += step
+                backlog -= step
+                ran = True
+                done = finished()
+
+            if not done and backlog >= due and skipped < self.max_catch_up:
+                stats.dropped_frames += 1
+                skipped += 1
+                continue
+            if done or ran or not stats.frames:
+                skipped = 0
+                started = clock()
+                render(now)
+                stats.render_times.append(clock() - started)
+                stats.frames += 1
+            if done:
+                return stats
+
+            spare = step - backlog - (clock() - frame_start)
+            if spare > 0:
+                with span("sleep"):
+                    self.sleep(spare)
+
+
+def _percentile(samples: Collection[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
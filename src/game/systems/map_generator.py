@@ -1,15 +1,120 @@
 import random
+from typing import Iterator
 
 TILE_FLOOR = 0
 TILE_WALL = 1
 TILE_DOOR = 9
+TILE_BORDER = 2
+PORTAL_TILES = (3, 4, 5)
+
+
+class DungeonGrid:
+    # Row-major tiles in one bytearray; index = y * width + x. `version` counts mutations made
+    # through set/fill_rect/replace so render caches know when to rebuild.
+    __slots__ = ("width", "height", "cells", "version")
+
+    def __init__(self, width: int, height: int, fill: int = TILE_WALL) -> None:
+        self.width = width
+        self.height = height
+        self.cells = bytearray([fill]) * (width * height)
+        self.version = 0
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, data: bytes) -> "DungeonGrid":
+        if len(data) != width * height:
+            raise ValueError(f"Expected {width * height} tiles, got {len(data)}.")
+        grid = cls(width, height)
+        grid.cells[:] = data
+        return grid
+
+    @classmethod
+    def from_rows(cls, rows: list[list[int]]) -> "DungeonGrid":
+        width = len(rows[0]) if rows else 0
+        return cls.from_bytes(width, len(rows), bytes(tile for row in rows for tile in row))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        # Read-only row views keep legacy `grid[y][x]` reads working on the flat buffer; writes go
+        # through set/fill_rect/replace so `version` always moves.
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("grid row out of range")
+        start = y * self.width
+        return memoryview(self.cells)[start : start + self.width].toreadonly()
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for y in range(self.height):
+            yield self[y]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DungeonGrid):
+            return NotImplemented
+        return (self.width, self.height, self.cells) == (other.width, other.height, other.cells)
+
+    __hash__ = None  # Mutable.
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int) -> int:
+        return self.cells[y * self.width + x]
+
+    def set(self, x: int, y: int, tile: int) -> None:
+        self.cells[y * self.width + x] = tile
+        self.version += 1
+
+    def row(self, y: int) -> bytes:
+        start = y * self.width
+        return bytes(self.cells[start : start + self.width])
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, tile: int) -> None:
+        span = bytes([tile]) * width
+        for row_y in range(y, y + height):
+            start = row_y * self.width + x
+            self.cells[start : start + width] = span
+        self.version += 1
+
+    def is_uniform(self, x: int, y: int, width: int, height: int, tile: int) -> bool:
+        span = bytes([tile]) * width
+        cells = self.cells
+        for row_y in range(y, y + height):
+            start = row_y * self.width + x
+            if cells[start : start + width] != span:
+                return False
+        return True
+
+    def replace(self, tiles: tuple[int, ...], new_tile: int) -> None:
+        table = bytearray(range(256))
+        for tile in tiles:
+            table[tile] = new_tile
+        self.cells[:] = self.cells.translate(table)
+        self.version += 1
+
+    def mask(self, tiles: tuple[int, ...]) -> bytearray:
+        table = bytearray(256)
+        for tile in tiles:
+            table[tile] = 1
+        return self.cells.translate(table)
+
+    def count(self, tile: int) -> int:
+        return self.cells.count(tile)
+
+    def copy(self) -> "DungeonGrid":
+        return DungeonGrid.from_bytes(self.width, self.height, self.cells)
+
+    def to_rows(self) -> list[list[int]]:
+        return [list(self.cells[y * self.width : (y + 1) * self.width]) for y in range(self.height)]
 
 
 class DungeonMap:
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        self.rng = rng or random.Random()
         self.rooms: list[list[int]] = []
         self.corridors: list[list[int]] = []
-        self.grid: list[list[int]] = []
+        self.grid = DungeonGrid(0, 0)
         self.width = 0
         self.height = 0
 
@@ -20,24 +125,24 @@ class DungeonMap:
         fail_limit: int = 110,
         corridor_percent: int = 50,
         max_rooms: int = 60,
-    ) -> list[list[int]]:
+    ) -> DungeonGrid:
         self.width = width
         self.height = height
         self.rooms = []
         self.corridors = []
-        self.grid = [[TILE_WALL for _ in range(width)] for _ in range(height)]
+        self.grid = DungeonGrid(width, height, TILE_WALL)
 
         room_w, room_h, room_type = self._make_room()
         while not self.rooms:
-            y = random.randrange(height - 1 - room_h) + 1
-            x = random.randrange(width - 1 - room_w) + 1
+            y = self.rng.randrange(height - 1 - room_h) + 1
+            x = self.rng.randrange(width - 1 - room_w) + 1
             self._place_feature(room_h, room_w, x, y, width, height, room_type, 0)
 
         failed = 0
         while failed < fail_limit:
-            room_index = random.randrange(len(self.rooms))
+            room_index = self.rng.randrange(len(self.rooms))
             ex, ey, ex2, ey2, exit_type = self._make_exit(room_index)
-            feature_roll = random.randrange(100)
+            feature_roll = self.rng.randrange(100)
             if feature_roll < corridor_percent:
                 feat_w, feat_h, feat_type = self._make_corridor()
             else:
@@ -56,7 +161,7 @@ class DungeonMap:
             if placed == 0:
                 failed += 1
             elif placed == 2:
-                if self.grid[ey2][ex2] == TILE_FLOOR and random.randrange(100) < 7:
+                if self.grid.get(ex2, ey2) == TILE_FLOOR and self.rng.randrange(100) < 7:
                     self._make_portal(ex, ey)
                 failed += 1
             else:
@@ -75,19 +180,28 @@ class DungeonMap:
         self._ensure_full_connectivity()
         return self.grid
 
+    def use_grid(self, grid: DungeonGrid) -> DungeonGrid:
+        # Adopts a grid generated elsewhere (e.g. loaded from a cache) for floor-tile queries.
+        self.width = grid.width
+        self.height = grid.height
+        self.rooms = []
+        self.corridors = []
+        self.grid = grid
+        return grid
+
     def random_floor_tile(self) -> tuple[int, int]:
         while True:
-            y = random.randrange(1, self.height - 1)
-            x = random.randrange(1, self.width - 1)
-            if self.grid[y][x] == TILE_FLOOR:
+            y = self.rng.randrange(1, self.height - 1)
+            x = self.rng.randrange(1, self.width - 1)
+            if self.grid.get(x, y) == TILE_FLOOR:
                 return x, y
 
     def _make_room(self) -> tuple[int, int, int]:
-        return random.randrange(8) + 3, random.randrange(8) + 3, 5
+        return self.rng.randrange(8) + 3, self.rng.randrange(8) + 3, 5
 
     def _make_corridor(self) -> tuple[int, int, int]:
-        length = random.randrange(18) + 3
-        heading = random.randrange(4)
+        length = self.rng.randrange(18) + 3
+        heading = self.rng.randrange(4)
         if heading == 0:
             return 1, -length, heading
         if heading == 1:
@@ -116,63 +230,55 @@ class DungeonMap:
 
         if feature_type == 5:
             if exit_type in (0, 2):
-                x -= random.randrange(width)
+                x -= self.rng.randrange(width)
             else:
-                y -= random.randrange(length)
+                y -= self.rng.randrange(length)
 
         if width + x + 1 > max_x - 1 or length + y + 1 > max_y or x < 1 or y < 1:
             return 0
 
-        can_place = 1
-        for j in range(length):
-            for k in range(width):
-                if self.grid[y + j][x + k] != TILE_WALL:
-                    can_place = 2
-
-        if can_place == 1:
-            self.rooms.append([length, width, x, y])
-            for j in range(length + 2):
-                for k in range(width + 2):
-                    self.grid[(y - 1) + j][(x - 1) + k] = 2
-            for j in range(length):
-                for k in range(width):
-                    self.grid[y + j][x + k] = TILE_FLOOR
-        return can_place
+        if not self.grid.is_uniform(x, y, width, length, TILE_WALL):
+            return 2
+
+        self.rooms.append([length, width, x, y])
+        self.grid.fill_rect(x - 1, y - 1, width + 2, length + 2, TILE_BORDER)
+        self.grid.fill_rect(x, y, width, length, TILE_FLOOR)
+        return 1
 
     def _make_exit(self, room_index: int) -> tuple[int, int, int, int, int]:
         room = self.rooms[room_index]
         while True:
-            wall = random.randrange(4)
+            wall = self.rng.randrange(4)
             if wall == 0:
-                rx = random.randrange(room[1]) + room[2]
+                rx = self.rng.randrange(room[1]) + room[2]
                 ry = room[3] - 1
                 rx2, ry2 = rx, ry - 1
             elif wall == 1:
-                ry = random.randrange(room[0]) + room[3]
+                ry = self.rng.randrange(room[0]) + room[3]
                 rx = room[2] + room[1]
                 rx2, ry2 = rx + 1, ry
             elif wall == 2:
-                rx = random.randrange(room[1]) + room[2]
+                rx = self.rng.randrange(room[1]) + room[2]
                 ry = room[3] + room[0]
                 rx2, ry2 = rx, ry + 1
             else:
-                ry = random.randrange(room[0]) + room[3]
+                ry = self.rng.randrange(room[0]) + room[3]
                 rx = room[2] - 1
                 rx2, ry2 = rx - 1, ry
 
-            if self.grid[ry][rx] == 2:
+            if self.grid.get(rx, ry) == TILE_BORDER:
                 return rx, ry, rx2, ry2, wall
 
     def _make_portal(self, px: int, py: int) -> None:
-        roll = random.randrange(100)
+        roll = self.rng.randrange(100)
         if roll > 90:
-            self.grid[py][px] = 5
+            self.grid.set(px, py, 5)
         elif roll > 75:
-            self.grid[py][px] = 4
+            self.grid.set(px, py, 4)
         elif roll > 40:
-            self.grid[py][px] = 3
+            self.grid.set(px, py, 3)
         else:
-            self.grid[py][px] = TILE_FLOOR
+            self.grid.set(px, py, TILE_FLOOR)
 
     def _join_corridor(self, corridor_index: int, x: int, y: int, direction: int, chance: int) -> None:
         corridor = self.rooms[corridor_index]
@@ -214,7 +320,7 @@ class DungeonMap:
                 exits.append([end_x, end_y + 2, end_x, end_y + 1])
 
         for ex, ey, px, py in exits:
-            if self.grid[ey][ex] == TILE_FLOOR and random.randrange(100) < chance:
+            if self.grid.get(ex, ey) == TILE_FLOOR and self.rng.randrange(100) < chance:
                 self._make_portal(px, py)
 
     def _final_joins(self) -> None:
@@ -223,65 +329,88 @@ class DungeonMap:
 
     def _normalize_walkable_tiles(self) -> None:
         # Portal variants produced by the original algorithm are walkable for gameplay.
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] in (3, 4, 5):
-                    self.grid[y][x] = TILE_FLOOR
+        self.grid.replace(PORTAL_TILES, TILE_FLOOR)
 
     def _ensure_full_connectivity(self) -> None:
         components = self._floor_components()
         if len(components) <= 1:
             return
 
-        main_component = max(components, key=len)
-        for component in components:
-            if component is main_component:
+        main_index = max(range(len(components)), key=lambda i: len(components[i]))
+        in_main = bytearray(self.width * self.height)
+        for idx in components[main_index]:
+            in_main[idx] = 1
+        for comp_index, component in enumerate(components):
+            if comp_index == main_index:
                 continue
-            a, b = self._nearest_cells(main_component, component)
+            a, b = self._nearest_cells(in_main, component)
             self._carve_l_corridor(a, b)
-            main_component = main_component | component
-
-    def _floor_components(self) -> list[set[tuple[int, int]]]:
-        visited: set[tuple[int, int]] = set()
-        components: list[set[tuple[int, int]]] = []
-
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] != TILE_FLOOR or (x, y) in visited:
-                    continue
-                stack = [(x, y)]
-                comp: set[tuple[int, int]] = set()
-                visited.add((x, y))
-                while stack:
-                    cx, cy = stack.pop()
-                    comp.add((cx, cy))
-                    for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
-                        if not (0 <= nx < self.width and 0 <= ny < self.height):
-                            continue
-                        if self.grid[ny][nx] != TILE_FLOOR or (nx, ny) in visited:
-                            continue
-                        visited.add((nx, ny))
-                        stack.append((nx, ny))
-                components.append(comp)
+            for idx in component:
+                in_main[idx] = 1
+
+    def _floor_components(self) -> list[list[int]]:
+        # Single-pass flood labelling over flat indices; each component is a list of cell indices.
+        width = self.width
+        size = width * self.height
+        blocked = bytearray([1]) * 256
+        blocked[TILE_FLOOR] = 0
+        seen = self.grid.cells.translate(blocked)
+        components: list[list[int]] = []
+
+        start = seen.find(0)
+        while start != -1:
+            seen[start] = 1
+            comp = [start]
+            stack = [start]
+            while stack:
+                idx = stack.pop()
+                x = idx % width
+                for n_idx in (
+                    idx + 1 if x + 1 < width else -1,
+                    idx - 1 if x > 0 else -1,
+                    idx + width if idx + width < size else -1,
+                    idx - width,
+                ):
+                    if n_idx < 0 or seen[n_idx]:
+                        continue
+                    seen[n_idx] = 1
+                    comp.append(n_idx)
+                    stack.append(n_idx)
+            components.append(comp)
+            start = seen.find(0, start + 1)
         return components
 
     def _nearest_cells(
         self,
-        comp_a: set[tuple[int, int]],
-        comp_b: set[tuple[int, int]],
+        in_main: bytearray,
+        component: list[int],
     ) -> tuple[tuple[int, int], tuple[int, int]]:
-        best_a = next(iter(comp_a))
-        best_b = next(iter(comp_b))
-        best_dist = abs(best_a[0] - best_b[0]) + abs(best_a[1] - best_b[1])
-
-        for ax, ay in comp_a:
-            for bx, by in comp_b:
-                dist = abs(ax - bx) + abs(ay - by)
-                if dist < best_dist:
-                    best_dist = dist
-                    best_a = (ax, ay)
-                    best_b = (bx, by)
-        return best_a, best_b
+        # Breadth-first rings from the component over the open grid follow Manhattan distance,
+        # so the first connected cell reached is a nearest pair.
+        width = self.width
+        size = width * self.height
+        origin = {idx: idx for idx in component}
+        frontier = list(component)
+        while frontier:
+            next_frontier: list[int] = []
+            for idx in frontier:
+                if in_main[idx]:
+                    src = origin[idx]
+                    return (idx % width, idx // width), (src % width, src // width)
+                x = idx % width
+                for n_idx in (
+                    idx + 1 if x + 1 < width else -1,
+                    idx - 1 if x > 0 else -1,
+                    idx + width if idx + width < size else -1,
+                    idx - width,
+                ):
+                    if n_idx < 0 or n_idx in origin:
+                        continue
+                    origin[n_idx] = origin[idx]
+                    next_frontier.append(n_idx)
+            frontier = next_frontier
+        first = component[0]
+        return (first % width, first // width), (first % width, first // width)
 
     def _carve_l_corridor(self, start: tuple[int, int], end: tuple[int, int]) -> None:
         sx, sy = start
@@ -289,28 +418,28 @@ class DungeonMap:
 
         x = sx
         while x != ex:
-            self.grid[sy][x] = TILE_FLOOR
+            self.grid.set(x, sy, TILE_FLOOR)
             x += 1 if ex > x else -1
-        self.grid[sy][ex] = TILE_FLOOR
+        self.grid.set(ex, sy, TILE_FLOOR)
 
         y = sy
         while y != ey:
-            self.grid[y][ex] = TILE_FLOOR
+            self.grid.set(ex, y, TILE_FLOOR)
             y += 1 if ey > y else -1
-        self.grid[ey][ex] = TILE_FLOOR
+        self.grid.set(ex, ey, TILE_FLOOR)
 
 
 def render_map(
-    grid: list[list[int]],
+    grid: DungeonGrid,
     player_pos: tuple[int, int],
     exit_pos: tuple[int, int],
 ) -> str:
     player_x, player_y = player_pos
     exit_x, exit_y = exit_pos
     rows: list[str] = []
-    for y, row in enumerate(grid):
+    for y in range(grid.height):
         chars: list[str] = []
-        for x, tile in enumerate(row):
+        for x, tile in enumerate(grid.row(y)):
             if (x, y) == (player_x, player_y):
                 chars.append("@")
             elif (x, y) == (exit_x, exit_y):
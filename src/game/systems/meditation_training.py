@@ -1,23 +1,126 @@
 import curses
 import math
 import random
-import time
+from array import array
 from dataclasses import dataclass
 from typing import Literal
 
-from ..models import Player
-
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it the entity store steps one slot at a time.
+    np = None
 
-@dataclass
-class MeditationEntity:
-    x: float
-    y: float
-    vx: float
-    vy: float
-    glyph: str
-    kind: Literal["enemy", "chaos", "particle"]
-    damage: int = 0
-    ttl: float = 0.0
+from ..frame_buffer import FrameBuffer, FrameLayer
+from ..models import Player
+from ..profiler import Profiler
+from .game_loop import FixedStepLoop, LoopStats
+
+KIND_ENEMY = 0
+KIND_CHAOS = 1
+KIND_PARTICLE = 2
+KIND_GLYPHS = ("x", "o", "*")
+
+
+class MeditationEntities:
+    # Structure-of-arrays store. Live entities are packed into slots [0, count) of preallocated
+    # typed arrays and the slots past count are free for the next spawn, so spawning never
+    # allocates an object. Removal compacts in place and keeps spawn order, which is also the
+    # draw order. Threats carry damage and an infinite ttl; particles carry no damage.
+    _VECTOR_MIN = 48
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.count = 0
+        self.capacity = capacity
+        self.x = array("d", bytes(8 * capacity))
+        self.y = array("d", bytes(8 * capacity))
+        self.vx = array("d", bytes(8 * capacity))
+        self.vy = array("d", bytes(8 * capacity))
+        self.ttl = array("d", bytes(8 * capacity))
+        self.kind = array("b", bytes(capacity))
+        self.damage = array("b", bytes(capacity))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, x: float, y: float, vx: float, vy: float, kind: int, damage: int, ttl: float) -> None:
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        self.x[slot] = x
+        self.y[slot] = y
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.ttl[slot] = ttl
+        self.kind[slot] = kind
+        self.damage[slot] = damage
+        self.count = slot + 1
+
+    def step(self, dt: float, orb_x: int, orb_y: int, max_x: float, max_y: float) -> int:
+        # Moves every entity, then drops expired particles, threats that reached the orb's cell
+        # and anything past (-2, -2)..(max_x, max_y). Returns the damage dealt to the orb.
+        if np is not None and self.count >= self._VECTOR_MIN:
+            return self._step_vector(dt, orb_x, orb_y, max_x, max_y)
+        return self._step_scalar(dt, orb_x, orb_y, max_x, max_y)
+
+    def _step_scalar(self, dt: float, orb_x: int, orb_y: int, max_x: float, max_y: float) -> int:
+        xs, ys, vxs, vys, ttls = self.x, self.y, self.vx, self.vy, self.ttl
+        kinds, damages = self.kind, self.damage
+        taken = 0
+        keep = 0
+        for i in range(self.count):
+            x = xs[i] + vxs[i] * dt
+            y = ys[i] + vys[i] * dt
+            ttl = ttls[i] - dt
+            if ttl <= 0.0:
+                continue
+            damage = damages[i]
+            if damage and int(round(x)) == orb_x and int(round(y)) == orb_y:
+                taken += damage
+                continue
+            if x < -2 or y < -2 or x > max_x or y > max_y:
+                continue
+            xs[keep] = x
+            ys[keep] = y
+            ttls[keep] = ttl
+            if keep != i:
+                vxs[keep] = vxs[i]
+                vys[keep] = vys[i]
+                kinds[keep] = kinds[i]
+                damages[keep] = damage
+            keep += 1
+        self.count = keep
+        return taken
+
+    def _step_vector(self, dt: float, orb_x: int, orb_y: int, max_x: float, max_y: float) -> int:
+        # Works on NumPy views of the same buffers; the views are dropped before the arrays can grow.
+        n = self.count
+        x = np.frombuffer(self.x, dtype=np.float64, count=n)
+        y = np.frombuffer(self.y, dtype=np.float64, count=n)
+        vx = np.frombuffer(self.vx, dtype=np.float64, count=n)
+        vy = np.frombuffer(self.vy, dtype=np.float64, count=n)
+        ttl = np.frombuffer(self.ttl, dtype=np.float64, count=n)
+        kind = np.frombuffer(self.kind, dtype=np.int8, count=n)
+        damage = np.frombuffer(self.damage, dtype=np.int8, count=n)
+
+        x += vx * dt
+        y += vy * dt
+        ttl -= dt
+        alive = ttl > 0.0
+        hit = alive & (damage > 0) & (np.rint(x) == orb_x) & (np.rint(y) == orb_y)
+        taken = int(damage[hit].sum())
+        keep = alive & ~hit & (x >= -2) & (y >= -2) & (x <= max_x) & (y <= max_y)
+        kept = np.flatnonzero(keep)
+        count = len(kept)
+        if count < n:
+            for column in (x, y, vx, vy, ttl, kind, damage):
+                column[:count] = column[kept]
+        self.count = count
+        return taken
+
+    def _grow(self) -> None:
+        for column in (self.x, self.y, self.vx, self.vy, self.ttl, self.kind, self.damage):
+            column.frombytes(bytes(column.itemsize * self.capacity))
+        self.capacity *= 2
 
 
 @dataclass
@@ -50,10 +153,20 @@ class MeditationTrainer:
     _INTENT_HOLD_SECONDS = 0.12
     _FRAME_SECONDS = 1.0 / 60.0
 
-    def __init__(self, stdscr: curses.window, player: Player) -> None:
+    def __init__(
+        self,
+        stdscr: curses.window,
+        player: Player,
+        rng: random.Random | None = None,
+        frame: FrameBuffer | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
         self.stdscr = stdscr
         self.player = player
-        self.rng = random.Random()
+        self.rng = rng or random.Random()
+        self.frame = frame or FrameBuffer()
+        self.profiler = profiler or Profiler()
+        self._chrome: FrameLayer | None = None
 
         max_y, max_x = self.stdscr.getmaxyx()
         self.frame_y = 1
@@ -79,41 +192,38 @@ class MeditationTrainer:
             hit_flash=0.0,
             quit_requested=False,
         )
-        self.entities: list[MeditationEntity] = []
+        self.entities = MeditationEntities()
+        # Entities live in typed arrays rather than objects, so there is nothing to pool.
+        self.pools = ()
         self.intent_dx = 0
         self.intent_dy = 0
         self.intent_ttl = 0.0
         self.phase = self.rng.randint(0, 999_999)
+        self.loop_stats = LoopStats()
 
     def run(self) -> MeditationResult:
         self.stdscr.nodelay(True)
         self.stdscr.keypad(True)
-        last = time.monotonic()
-        ended_by: Literal["focus_zero", "quit"] = "focus_zero"
         try:
-            while True:
-                now = time.monotonic()
-                dt = min(0.05, now - last)
-                last = now
-
-                self.handle_input()
-                self.update(dt)
-                self.render()
-
-                if self.state.quit_requested:
-                    ended_by = "quit"
-                    break
-                if self.state.focus <= 0:
-                    ended_by = "focus_zero"
-                    break
-
-                spent = time.monotonic() - now
-                if spent < self._FRAME_SECONDS:
-                    time.sleep(self._FRAME_SECONDS - spent)
+            self.loop_stats = FixedStepLoop(self._FRAME_SECONDS, profiler=self.profiler).run(
+                lambda now: self.handle_input(),
+                lambda dt, now: self.update(dt),
+                lambda now: self.render(),
+                self.finished,
+            )
         finally:
             self.stdscr.nodelay(False)
 
-        return self._build_result(ended_by)
+        return self.result()
+
+    def result(self) -> MeditationResult:
+        return self._build_result(self.ended_by())
+
+    def finished(self) -> bool:
+        return self.state.quit_requested or self.state.focus <= 0
+
+    def ended_by(self) -> Literal["focus_zero", "quit"]:
+        return "quit" if self.state.quit_requested else "focus_zero"
 
     def handle_input(self) -> None:
         while True:
@@ -163,48 +273,40 @@ class MeditationTrainer:
 
         while self.state.enemy_timer >= enemy_interval:
             self.state.enemy_timer -= enemy_interval
-            self.entities.append(self._spawn_threat("enemy"))
+            self._spawn_threat(KIND_ENEMY)
         while self.state.chaos_timer >= chaos_interval:
             self.state.chaos_timer -= chaos_interval
-            self.entities.append(self._spawn_threat("chaos"))
+            self._spawn_threat(KIND_CHAOS)
         while self.state.particle_timer >= particle_interval:
             self.state.particle_timer -= particle_interval
-            self.entities.append(self._spawn_particle())
-
-        updated: list[MeditationEntity] = []
-        orb_cell = (int(round(self.state.orb_x)), int(round(self.state.orb_y)))
-        for entity in self.entities:
-            entity.x += entity.vx * dt
-            entity.y += entity.vy * dt
-
-            if entity.kind == "particle":
-                entity.ttl -= dt
-                if entity.ttl <= 0.0:
-                    continue
-
-            if entity.kind in ("enemy", "chaos"):
-                cell = (int(round(entity.x)), int(round(entity.y)))
-                if cell == orb_cell:
-                    self.state.focus -= entity.damage
-                    self.state.hit_flash = 0.12
-                    continue
-
-            if (
-                entity.x < -2
-                or entity.y < -2
-                or entity.x > self.arena_w + 2
-                or entity.y > self.arena_h + 2
-            ):
-                continue
-            updated.append(entity)
-        self.entities = updated
+            self._spawn_particle()
+
+        taken = self.entities.step(
+            dt,
+            int(round(self.state.orb_x)),
+            int(round(self.state.orb_y)),
+            self.arena_w + 2,
+            self.arena_h + 2,
+        )
+        if taken:
+            self.state.focus -= taken
+            self.state.hit_flash = 0.12
 
     def render(self) -> None:
-        self.stdscr.erase()
-        self._draw_border()
-        self._draw_arena()
-        self._draw_hud()
-        self.stdscr.refresh()
+        with self.profiler.span("draw"):
+            # Frame and arena borders never change, so they are drawn once and restored each frame.
+            if self._chrome is None or not self.frame.restore(self._chrome):
+                self.frame.begin(self.stdscr)
+                self._draw_border()
+                self._draw_arena_borders()
+                self._chrome = self.frame.snapshot()
+            self._draw_arena()
+            self._draw_hud()
+        with self.profiler.span("refresh"):
+            self.profiler.draw_overlay(self.frame)
+            self.frame.present(self.stdscr)
+            self._flush()
+        self.profiler.frame()
 
     def _draw_border(self) -> None:
         self._safe_addstr(
@@ -229,7 +331,7 @@ class MeditationTrainer:
             self._c(3),
         )
 
-    def _draw_arena(self) -> None:
+    def _draw_arena_borders(self) -> None:
         for x in range(self.arena_x, self.arena_x + self.arena_w):
             self._safe_addstr(self.arena_y, x, "-", self._c(1))
             self._safe_addstr(self.arena_y + self.arena_h - 1, x, "-", self._c(1))
@@ -237,6 +339,7 @@ class MeditationTrainer:
             self._safe_addstr(y, self.arena_x, "|", self._c(1))
             self._safe_addstr(y, self.arena_x + self.arena_w - 1, "|", self._c(1))
 
+    def _draw_arena(self) -> None:
         noise_steps = 10 + min(80, int(self.state.elapsed * 2.3))
         for i in range(noise_steps):
             nx = self.arena_x + 1 + ((i * 11 + self.phase) % max(1, self.arena_w - 2))
@@ -244,16 +347,13 @@ class MeditationTrainer:
             glyph = "." if (i + self.phase) % 2 == 0 else "'"
             self._safe_addstr(ny, nx, glyph, self._c(2) | curses.A_DIM)
 
-        for entity in self.entities:
-            ex = self.arena_x + int(round(entity.x))
-            ey = self.arena_y + int(round(entity.y))
-            if entity.kind == "enemy":
-                attr = self._c(4) | curses.A_BOLD
-            elif entity.kind == "chaos":
-                attr = self._c(3)
-            else:
-                attr = self._c(2) | curses.A_DIM
-            self._safe_addstr(ey, ex, entity.glyph, attr)
+        entities = self.entities
+        kind_attrs = (self._c(4) | curses.A_BOLD, self._c(3), self._c(2) | curses.A_DIM)
+        for i in range(entities.count):
+            kind = entities.kind[i]
+            ex = self.arena_x + int(round(entities.x[i]))
+            ey = self.arena_y + int(round(entities.y[i]))
+            self._safe_addstr(ey, ex, KIND_GLYPHS[kind], kind_attrs[kind])
 
         orb_x = self.arena_x + int(round(self.state.orb_x))
         orb_y = self.arena_y + int(round(self.state.orb_y))
@@ -277,7 +377,7 @@ class MeditationTrainer:
             self._c(1),
         )
 
-    def _spawn_threat(self, kind: Literal["enemy", "chaos"]) -> MeditationEntity:
+    def _spawn_threat(self, kind: int) -> None:
         side = self.rng.randint(0, 3)
         if side == 0:
             x = 1.0
@@ -294,25 +394,23 @@ class MeditationTrainer:
 
         tx = self.state.orb_x - x
         ty = self.state.orb_y - y
-        if kind == "chaos":
+        if kind == KIND_CHAOS:
             tx += self.rng.uniform(-4.0, 4.0)
             ty += self.rng.uniform(-4.0, 4.0)
 
         length = max(0.001, math.hypot(tx, ty))
         ux, uy = tx / length, ty / length
 
-        if kind == "enemy":
+        if kind == KIND_ENEMY:
             speed = 7.0 + min(7.0, self.state.elapsed * 0.08)
-            glyph = "x"
             damage = 2
         else:
             speed = 5.8 + min(5.0, self.state.elapsed * 0.06)
-            glyph = "o"
             damage = 1
 
-        return MeditationEntity(x=x, y=y, vx=ux * speed, vy=uy * speed, glyph=glyph, kind=kind, damage=damage)
+        self.entities.add(x, y, ux * speed, uy * speed, kind, damage, math.inf)
 
-    def _spawn_particle(self) -> MeditationEntity:
+    def _spawn_particle(self) -> None:
         side = self.rng.randint(0, 3)
         if side == 0:
             x, y = 1.0, self.rng.uniform(1.0, self.arena_h - 2.0)
@@ -326,15 +424,7 @@ class MeditationTrainer:
         else:
             x, y = self.rng.uniform(1.0, self.arena_w - 2.0), self.arena_h - 2.0
             vx, vy = self.rng.uniform(-0.5, 0.5), self.rng.uniform(-1.4, -0.4)
-        return MeditationEntity(
-            x=x,
-            y=y,
-            vx=vx,
-            vy=vy,
-            glyph="*",
-            kind="particle",
-            ttl=self.rng.uniform(1.2, 2.8),
-        )
+        self.entities.add(x, y, vx, vy, KIND_PARTICLE, 0, self.rng.uniform(1.2, 2.8))
 
     def _build_result(self, ended_by: Literal["focus_zero", "quit"]) -> MeditationResult:
         elapsed = self.state.elapsed
@@ -363,28 +453,31 @@ class MeditationTrainer:
         )
 
     def _safe_addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
-        max_y, max_x = self.stdscr.getmaxyx()
-        if y < 0 or y >= max_y or x >= max_x:
-            return
-        if x < 0:
-            text = text[-x:]
-            x = 0
-        if not text:
-            return
-        clipped = text[: max_x - x]
-        if not clipped:
-            return
-        try:
-            self.stdscr.addstr(y, x, clipped, attr)
-        except curses.error:
-            return
+        self.frame.put(y, x, text, attr)
 
     def _c(self, pair_id: int) -> int:
-        if not curses.has_colors():
+        # curses.error here means no initscr(), i.e. a headless run (see trainer_sim).
+        try:
+            if not curses.has_colors():
+                return 0
+            return curses.color_pair(pair_id)
+        except curses.error:
             return 0
-        return curses.color_pair(pair_id)
+
+    def _flush(self) -> None:
+        self.stdscr.noutrefresh()
+        try:
+            curses.doupdate()
+        except curses.error:
+            pass
 
 
-def start_meditation_training(stdscr: curses.window, player: Player) -> MeditationResult:
-    trainer = MeditationTrainer(stdscr, player)
+def start_meditation_training(
+    stdscr: curses.window,
+    player: Player,
+    rng: random.Random | None = None,
+    frame: FrameBuffer | None = None,
+    profiler: Profiler | None = None,
+) -> MeditationResult:
+    trainer = MeditationTrainer(stdscr, player, rng, frame, profiler)
     return trainer.run()
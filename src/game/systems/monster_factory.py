@@ -0,0 +1,35 @@
+from typing import Any
+
+from ..models import Monster
+from .combat import scale_boss, scale_encounter
+
+# Monster fields in constructor order; a stat row holds one value per field.
+_FIELDS = ("name", "hp", "strength", "defense", "speed", "xp_reward", "gold_reward")
+
+
+def _row(monster: Monster) -> tuple:
+    return tuple(getattr(monster, field) for field in _FIELDS)
+
+
+class MonsterFactory:
+    # Tier-scaled stat rows memoised per (template name, tier) for one monsters section: the
+    # engine builds a new factory whenever the monsters are (re)loaded, which is the only
+    # invalidation needed. Each row is computed once with the scale_* formulas in combat.py,
+    # after which creating a monster is a dict lookup and a Monster(*row).
+    def __init__(self, boss_template: dict[str, Any]) -> None:
+        self.boss_template = boss_template
+        self._encounter_rows: dict[tuple[str, int], tuple] = {}
+        self._boss_rows: dict[int, tuple] = {}
+
+    def encounter(self, template: dict[str, Any], tier: int) -> Monster:
+        key = (template["name"], tier)
+        row = self._encounter_rows.get(key)
+        if row is None:
+            row = self._encounter_rows[key] = _row(scale_encounter(template, tier))
+        return Monster(*row)
+
+    def boss(self, tier: int) -> Monster:
+        row = self._boss_rows.get(tier)
+        if row is None:
+            row = self._boss_rows[tier] = _row(scale_boss(self.boss_template, tier))
+        return Monster(*row)
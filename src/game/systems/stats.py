@@ -0,0 +1,49 @@
+from collections import Counter
+
+from ..models import Player
+
+# Shared by the game and the headless tools (balance sweep, trainer sim), so nothing here may
+# import the curses front end.
+CLASS_TEMPLATES = {
+    "Warrior": {"hp": 120, "mp": 16, "strength": 16, "defense": 12, "speed": 8},
+    "Mage": {"hp": 85, "mp": 36, "strength": 18, "defense": 7, "speed": 10},
+    "Archer": {"hp": 95, "mp": 20, "strength": 14, "defense": 9, "speed": 14},
+}
+
+
+def player_at_level(archetype: str, level: int) -> Player:
+    stats = CLASS_TEMPLATES[archetype]
+    player = Player(
+        name=f"Sim {archetype}",
+        archetype=archetype,
+        max_hp=stats["hp"],
+        hp=stats["hp"],
+        max_mp=stats["mp"],
+        mp=stats["mp"],
+        strength=stats["strength"],
+        defense=stats["defense"],
+        speed=stats["speed"],
+    )
+    while player.level < level:
+        player.gain_xp(player.level * 100 - player.xp)
+    return player
+
+
+def histogram_mean(histogram: Counter[int]) -> float:
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    return sum(value * count for value, count in histogram.items()) / total
+
+
+def histogram_percentile(histogram: Counter[int], q: float) -> int:
+    total = sum(histogram.values())
+    if not total:
+        return 0
+    threshold = max(1, int(round(q * total)))
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= threshold:
+            return value
+    return max(histogram)
@@ -0,0 +1,306 @@
+import argparse
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from ..models import Player
+from ..rng import RngContext
+from .archer_training import ArcherTrainer
+from .game_loop import FixedStepLoop
+from .meditation_training import KIND_PARTICLE, MeditationTrainer
+from .stats import histogram_mean, histogram_percentile, player_at_level
+from .warrior_training import WarriorTrainer
+
+KEY_UP = ord("w")
+KEY_DOWN = ord("s")
+KEY_LEFT = ord("a")
+KEY_RIGHT = ord("d")
+KEY_SPACE = ord(" ")
+
+# Policies see the trainer and the simulated time, and return the keys pressed this step.
+KeyPolicy = Callable[[Any, float], list[int]]
+
+
+class FakeScreen:
+    # Just enough of a curses window for the trainers: a fixed size, a key queue and no-op output.
+    def __init__(self, height: int = 40, width: int = 120) -> None:
+        self.height = height
+        self.width = width
+        self.keys: list[int] = []
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def getch(self) -> int:
+        return self.keys.pop(0) if self.keys else -1
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        pass
+
+    def nodelay(self, flag: bool) -> None:
+        pass
+
+    def keypad(self, flag: bool) -> None:
+        pass
+
+    def noutrefresh(self) -> None:
+        pass
+
+
+class SimulatedClock:
+    # Time moves only when the loop sleeps, so every pass with an update sleeps exactly one step.
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def idle_policy(trainer: Any, now: float) -> list[int]:
+    return []
+
+
+def archer_policy(trainer: ArcherTrainer, now: float) -> list[int]:
+    real = [t for t in trainer.targets if not t.fake]
+    if not real:
+        return []
+    target = min(real, key=lambda t: t.x)
+    lane = int(round(target.y))
+    if trainer.archer_y < lane:
+        return [KEY_DOWN]
+    if trainer.archer_y > lane:
+        return [KEY_UP]
+    return [KEY_SPACE] if trainer.shot_cooldown <= 0 or trainer.charging else []
+
+
+def warrior_policy(trainer: WarriorTrainer, now: float) -> list[int]:
+    keys = {"north": KEY_UP, "south": KEY_DOWN, "west": KEY_LEFT, "east": KEY_RIGHT}
+    for atk in trainer.attacks:
+        if atk.fake:
+            continue
+        if abs(atk.x - trainer.center_x) + abs(atk.y - trainer.center_y) <= 1.2:
+            return [keys[atk.source]]
+    return []
+
+
+def meditation_policy(trainer: MeditationTrainer, now: float) -> list[int]:
+    state = trainer.state
+    entities = trainer.entities
+    threats = [i for i in range(entities.count) if entities.kind[i] != KIND_PARTICLE]
+    if not threats:
+        return []
+
+    def distance(i: int) -> float:
+        return abs(entities.x[i] - state.orb_x) + abs(entities.y[i] - state.orb_y)
+
+    nearest = min(threats, key=distance)
+    if distance(nearest) > 5.0:
+        return []
+    # Step sideways to the threat's path, toward the roomier side of the arena.
+    if abs(entities.vx[nearest]) >= abs(entities.vy[nearest]):
+        return [KEY_UP if state.orb_y > trainer.arena_h / 2 else KEY_DOWN]
+    return [KEY_LEFT if state.orb_x > trainer.arena_w / 2 else KEY_RIGHT]
+
+
+@dataclass(frozen=True)
+class TrainerSpec:
+    trainer: type
+    policy: KeyPolicy
+    handle_input: Callable[[Any, float], None]
+    update: Callable[[Any, float, float], None]
+    render: Callable[[Any, float], None]
+
+
+TRAINERS: dict[str, TrainerSpec] = {
+    "archer": TrainerSpec(
+        ArcherTrainer,
+        archer_policy,
+        lambda t, now: t.handle_input(now),
+        lambda t, dt, now: t.update(dt, now),
+        lambda t, now: t.render(now),
+    ),
+    "warrior": TrainerSpec(
+        WarriorTrainer,
+        warrior_policy,
+        lambda t, now: t.handle_input(now),
+        lambda t, dt, now: t.update(dt, now),
+        lambda t, now: t.render(now),
+    ),
+    "meditation": TrainerSpec(
+        MeditationTrainer,
+        meditation_policy,
+        lambda t, now: t.handle_input(),
+        lambda t, dt, now: t.update(dt),
+        lambda t, now: t.render(),
+    ),
+}
+
+
+@dataclass
+class TrainerReport:
+    runs: int = 0
+    steps: int = 0
+    update_seconds: float = 0.0
+    # Pooled entity instances: the most any single run created, and how many spawns reused them.
+    peak_created: int = 0
+    acquired: int = 0
+    ended_by: Counter[str] = field(default_factory=Counter)
+    xp_gain: Counter[int] = field(default_factory=Counter)
+    hp_cost: Counter[int] = field(default_factory=Counter)
+    stat_gains: Counter[str] = field(default_factory=Counter)
+
+    def mean_xp(self) -> float:
+        return histogram_mean(self.xp_gain)
+
+    def mean_hp_cost(self) -> float:
+        return histogram_mean(self.hp_cost)
+
+    def xp_percentile(self, q: float) -> int:
+        return histogram_percentile(self.xp_gain, q)
+
+    def hp_percentile(self, q: float) -> int:
+        return histogram_percentile(self.hp_cost, q)
+
+    def update_us(self) -> float:
+        return self.update_seconds / self.steps * 1e6 if self.steps else 0.0
+
+    def add(self, result: Any) -> None:
+        self.runs += 1
+        self.ended_by[result.ended_by] += 1
+        self.xp_gain[result.xp_gain] += 1
+        self.hp_cost[result.hp_cost] += 1
+        for name, label in (("strength_gain", "STR"), ("defense_gain", "DEF"), ("speed_gain", "SPD")):
+            self.stat_gains[label] += getattr(result, name, 0)
+
+    def summary(self) -> str:
+        endings = ", ".join(f"{name} {count}" for name, count in self.ended_by.most_common())
+        gains = ", ".join(f"+{count} {label}" for label, count in sorted(self.stat_gains.items()) if count)
+        return (
+            f"{self.runs} runs ({endings}) | XP mean {self.mean_xp():.1f} "
+            f"p10 {self.xp_percentile(0.1)} p90 {self.xp_percentile(0.9)} | "
+            f"HP cost mean {self.mean_hp_cost():.1f} p90 {self.hp_percentile(0.9)} | "
+            f"stat gains {gains or 'none'} | update {self.update_us():.1f} us/step"
+            + (f" | pooled {self.acquired} spawns, peak {self.peak_created} objects/run" if self.acquired else "")
+        )
+
+
+def run_headless(
+    kind: str,
+    player: Player,
+    rng: random.Random | None = None,
+    policy: KeyPolicy | None = None,
+    script: list[tuple[float, int]] | None = None,
+    step: float = 1.0 / 60.0,
+    max_seconds: float = 300.0,
+    render: bool = False,
+    report: TrainerReport | None = None,
+) -> Any:
+    # Steps one trainer through FixedStepLoop on a simulated clock as fast as possible. Keys
+    # come from `script` ((time, key) pairs) when given, otherwise from `policy`, once per
+    # simulated step. A run that reaches `max_seconds` is ended as if the player quit.
+    spec = TRAINERS[kind]
+    screen = FakeScreen()
+    trainer = spec.trainer(screen, player, rng)
+    policy = policy or spec.policy
+    pending = sorted(script or [])
+    clock = SimulatedClock()
+    fed_at = -1.0
+    elapsed = 0.0
+    spent = 0.0
+
+    def handle_input(now: float) -> None:
+        nonlocal fed_at
+        # The loop polls input again on passes without an update; feed each step's keys once.
+        if now > fed_at:
+            fed_at = now
+            if script is not None:
+                while pending and pending[0][0] <= now:
+                    screen.keys.append(pending.pop(0)[1])
+            else:
+                screen.keys.extend(policy(trainer, now))
+        spec.handle_input(trainer, now)
+
+    def update(dt: float, now: float) -> None:
+        nonlocal elapsed, spent
+        started = time.perf_counter()
+        spec.update(trainer, dt, now)
+        spent += time.perf_counter() - started
+        elapsed = now + dt
+
+    def finished() -> bool:
+        if not trainer.finished() and elapsed >= max_seconds:
+            _request_quit(trainer)
+        return trainer.finished()
+
+    stats = FixedStepLoop(step, clock=clock, sleep=clock.sleep).run(
+        handle_input,
+        update,
+        (lambda now: spec.render(trainer, now)) if render else (lambda now: None),
+        finished,
+    )
+    if report is not None:
+        report.steps += stats.updates
+        report.update_seconds += spent
+        report.peak_created = max(report.peak_created, sum(pool.created for pool in trainer.pools))
+        report.acquired += sum(pool.acquired for pool in trainer.pools)
+    return trainer.result()
+
+
+def simulate_training(
+    kind: str,
+    player: Player,
+    runs: int = 1000,
+    seed: int = 0,
+    policy: KeyPolicy | None = None,
+    step: float = 1.0 / 60.0,
+    max_seconds: float = 300.0,
+    render: bool = False,
+) -> TrainerReport:
+    report = TrainerReport()
+    context = RngContext(seed)
+    for run in range(runs):
+        rng = random.Random(context.derive_seed(f"training/{kind}/{run}"))
+        result = run_headless(kind, player, rng, policy, None, step, max_seconds, render, report)
+        report.add(result)
+    return report
+
+
+def _request_quit(trainer: Any) -> None:
+    if isinstance(trainer, MeditationTrainer):
+        trainer.state.quit_requested = True
+    else:
+        trainer.quit_requested = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run class trainers headless with a bot or idle input.")
+    parser.add_argument("kind", choices=sorted(TRAINERS))
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=["bot", "idle"], default="bot")
+    parser.add_argument("--max-seconds", type=float, default=300.0)
+    parser.add_argument("--render", action="store_true", help="also compose frames (off-screen)")
+    args = parser.parse_args()
+
+    archetype = {"archer": "Archer", "warrior": "Warrior", "meditation": "Mage"}[args.kind]
+    started = time.perf_counter()
+    report = simulate_training(
+        args.kind,
+        player_at_level(archetype, 1),
+        runs=args.runs,
+        seed=args.seed,
+        policy=idle_policy if args.policy == "idle" else None,
+        max_seconds=args.max_seconds,
+        render=args.render,
+    )
+    print(report.summary())
+    print(f"{time.perf_counter() - started:.2f}s wall for {report.steps} simulated steps.")
+
+
+if __name__ == "__main__":
+    main()
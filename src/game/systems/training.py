@@ -3,13 +3,14 @@ import random
 from ..models import Player
 
 
-def train(player: Player) -> None:
+def train(player: Player, rng: random.Random | None = None) -> None:
+    rng = rng or random.Random()
     print("\n=== Training Grounds ===")
     print("You spend time improving your technique.")
 
-    xp_gain = random.randint(20, 40)
-    hp_cost = random.randint(4, 10)
-    speed_gain = 1 if random.random() < 0.3 else 0
+    xp_gain = rng.randint(20, 40)
+    hp_cost = rng.randint(4, 10)
+    speed_gain = 1 if rng.random() < 0.3 else 0
 
     player.hp = max(1, player.hp - hp_cost)
     player.strength += 1
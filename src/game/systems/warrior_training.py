@@ -1,14 +1,17 @@
 import curses
 import os
 import random
-import time
 from dataclasses import dataclass
 from typing import Literal
 
+from ..frame_buffer import FrameBuffer, FrameLayer
 from ..models import Player
+from ..profiler import Profiler
+from .entity_pool import EntityPool
+from .game_loop import FixedStepLoop, LoopStats
 
 
-@dataclass
+@dataclass(slots=True)
 class IncomingAttack:
     x: float
     y: float
@@ -42,10 +45,20 @@ class WarriorTrainer:
     _WRONG_FAKE_COST = 2
     _INPUT_BUFFER = 0.18
 
-    def __init__(self, stdscr: curses.window, player: Player) -> None:
+    def __init__(
+        self,
+        stdscr: curses.window,
+        player: Player,
+        rng: random.Random | None = None,
+        frame: FrameBuffer | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
         self.stdscr = stdscr
         self.player = player
-        self.rng = random.Random()
+        self.rng = rng or random.Random()
+        self.frame = frame or FrameBuffer()
+        self.profiler = profiler or Profiler()
+        self._chrome: FrameLayer | None = None
         self._unicode_ui = os.environ.get("TERM_REALMS_ASCII", "0") != "1"
 
         max_y, max_x = self.stdscr.getmaxyx()
@@ -73,34 +86,38 @@ class WarriorTrainer:
         self.quit_requested = False
 
         self.attacks: list[IncomingAttack] = []
+        self.attack_pool: EntityPool[IncomingAttack] = EntityPool(IncomingAttack)
+        self.pools = (self.attack_pool,)
         self.last_input_dir: Literal["north", "south", "east", "west"] | None = None
         self.last_input_time = 0.0
         self.flash_until = 0.0
         self.parry_flash_until = 0.0
+        self.loop_stats = LoopStats()
 
     def run(self) -> WarriorTrainingResult:
         self.stdscr.nodelay(True)
         self.stdscr.keypad(True)
-        last = time.monotonic()
         try:
-            while self.stamina > 0 and not self.quit_requested:
-                now = time.monotonic()
-                dt = min(0.05, now - last)
-                last = now
-                self.handle_input(now)
-                self.update(dt, now)
-                self.render(now)
-                spent = time.monotonic() - now
-                if spent < self._FRAME_DT:
-                    time.sleep(self._FRAME_DT - spent)
+            self.loop_stats = FixedStepLoop(self._FRAME_DT, profiler=self.profiler).run(
+                self.handle_input,
+                self.update,
+                self.render,
+                self.finished,
+            )
         finally:
             self.stdscr.nodelay(False)
+        return self.result()
+
+    def result(self) -> WarriorTrainingResult:
         if self.quit_requested:
             self.ended_by = "quit"
         else:
             self.ended_by = "stamina_zero"
         return self._build_result()
 
+    def finished(self) -> bool:
+        return self.stamina <= 0 or self.quit_requested
+
     def handle_input(self, now: float) -> None:
         while True:
             key = self.stdscr.getch()
@@ -132,14 +149,22 @@ class WarriorTrainer:
             atk.y += atk.vy * dt
 
         self._resolve_attacks(now)
-        self.attacks = [a for a in self.attacks if not self._out_of_bounds(a)]
 
     def render(self, now: float) -> None:
-        self.stdscr.erase()
-        self._draw_frame()
-        self._draw_arena(now)
-        self._draw_hud()
-        self.stdscr.refresh()
+        with self.profiler.span("draw"):
+            # Frame and arena borders never change, so they are drawn once and restored each frame.
+            if self._chrome is None or not self.frame.restore(self._chrome):
+                self.frame.begin(self.stdscr)
+                self._draw_frame()
+                self._draw_arena_borders()
+                self._chrome = self.frame.snapshot()
+            self._draw_arena(now)
+            self._draw_hud()
+        with self.profiler.span("refresh"):
+            self.profiler.draw_overlay(self.frame)
+            self.frame.present(self.stdscr)
+            self._flush()
+        self.profiler.frame()
 
     def _draw_frame(self) -> None:
         h = "─" if self._unicode_ok() else "-"
@@ -161,7 +186,7 @@ class WarriorTrainer:
         title = " WARRIOR REFLEX TRAINING "
         self._safe_addstr(self.frame_y, self.frame_x + 2, title, self._c(3) | curses.A_BOLD)
 
-    def _draw_arena(self, now: float) -> None:
+    def _draw_arena_borders(self) -> None:
         arena_h = "─" if self._unicode_ok() else "-"
         arena_v = "│" if self._unicode_ok() else "|"
         for x in range(self.arena_x, self.arena_x + self.arena_w):
@@ -171,6 +196,7 @@ class WarriorTrainer:
             self._safe_addstr(y, self.arena_x, arena_v, self._c(1))
             self._safe_addstr(y, self.arena_x + self.arena_w - 1, arena_v, self._c(1))
 
+    def _draw_arena(self, now: float) -> None:
         for i in range(24):
             nx = self.arena_x + 1 + ((self.phase + i * 7) % max(1, self.arena_w - 2))
             ny = self.arena_y + 1 + ((self.phase // 2 + i * 5) % max(1, self.arena_h - 2))
@@ -240,7 +266,7 @@ class WarriorTrainer:
         fake: bool,
     ) -> IncomingAttack:
         if source == "north":
-            return IncomingAttack(
+            return self.attack_pool.acquire(
                 x=float(self.center_x),
                 y=1.0,
                 vx=0.0,
@@ -250,7 +276,7 @@ class WarriorTrainer:
                 fake=fake,
             )
         if source == "south":
-            return IncomingAttack(
+            return self.attack_pool.acquire(
                 x=float(self.center_x),
                 y=float(self.arena_h - 2),
                 vx=0.0,
@@ -260,7 +286,7 @@ class WarriorTrainer:
                 fake=fake,
             )
         if source == "east":
-            return IncomingAttack(
+            return self.attack_pool.acquire(
                 x=float(self.arena_w - 2),
                 y=float(self.center_y),
                 vx=-speed,
@@ -269,7 +295,7 @@ class WarriorTrainer:
                 glyph="<",
                 fake=fake,
             )
-        return IncomingAttack(
+        return self.attack_pool.acquire(
             x=1.0,
             y=float(self.center_y),
             vx=speed,
@@ -283,8 +309,10 @@ class WarriorTrainer:
         if self.last_input_dir is not None and now - self.last_input_time > self._INPUT_BUFFER:
             self.last_input_dir = None
 
-        keep: list[IncomingAttack] = []
-        for atk in self.attacks:
+        # Survivors are compacted in place, in order, and dropped attacks go back to the pool.
+        attacks = self.attacks
+        keep = 0
+        for atk in attacks:
             dist = abs(atk.x - self.center_x) + abs(atk.y - self.center_y)
             in_window = dist <= 1.25
             at_center = dist <= 0.35
@@ -299,6 +327,7 @@ class WarriorTrainer:
                     self.parries += 1
                     self.parry_flash_until = now + 0.11
                 self.last_input_dir = None
+                self.attack_pool.release(atk)
                 continue
 
             if at_center:
@@ -306,9 +335,14 @@ class WarriorTrainer:
                     self.stamina -= self._BAD_BLOCK_COST
                     self.failures += 1
                     self.flash_until = now + 0.18
+                self.attack_pool.release(atk)
+                continue
+            if self._out_of_bounds(atk):
+                self.attack_pool.release(atk)
                 continue
-            keep.append(atk)
-        self.attacks = keep
+            attacks[keep] = atk
+            keep += 1
+        del attacks[keep:]
 
     def _direction_from_key(self, key: int) -> Literal["north", "south", "east", "west"] | None:
         if key in (ord("w"), ord("W"), curses.KEY_UP):
@@ -362,30 +396,33 @@ class WarriorTrainer:
         )
 
     def _safe_addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
-        max_y, max_x = self.stdscr.getmaxyx()
-        if y < 0 or y >= max_y or x >= max_x:
-            return
-        if x < 0:
-            text = text[-x:]
-            x = 0
-        if not text:
-            return
-        clipped = text[: max_x - x]
-        if not clipped:
-            return
-        try:
-            self.stdscr.addstr(y, x, clipped, attr)
-        except curses.error:
-            pass
+        self.frame.put(y, x, text, attr)
 
     def _c(self, pair_id: int) -> int:
-        if not curses.has_colors():
+        # curses.error here means no initscr(), i.e. a headless run (see trainer_sim).
+        try:
+            if not curses.has_colors():
+                return 0
+            return curses.color_pair(pair_id)
+        except curses.error:
             return 0
-        return curses.color_pair(pair_id)
+
+    def _flush(self) -> None:
+        self.stdscr.noutrefresh()
+        try:
+            curses.doupdate()
+        except curses.error:
+            pass
 
     def _unicode_ok(self) -> bool:
         return self._unicode_ui
 
 
-def start_warrior_training(stdscr: curses.window, player: Player) -> WarriorTrainingResult:
-    return WarriorTrainer(stdscr, player).run()
+def start_warrior_training(
+    stdscr: curses.window,
+    player: Player,
+    rng: random.Random | None = None,
+    frame: FrameBuffer | None = None,
+    profiler: Profiler | None = None,
+) -> WarriorTrainingResult:
+    return WarriorTrainer(stdscr, player, rng, frame, profiler).run()